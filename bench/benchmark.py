@@ -0,0 +1,230 @@
+"""
+Benchmark für die Umwandlung CSV -> TEMU.xlsx.
+
+1. Stufen: importiert das Paket temu_update (ohne den Ablauf zu starten) und misst jeden Schritt
+   einzeln (CSV lesen, Standardwerte, Länder, Maße, Artikelanzahl, Kategorien, Filter,
+   Zellwerte, Dropdown-Prüfung, Schreiben) mit der mitgelieferten TEMU.xlsx. Caches sind dabei aus.
+2. Gesamtlauf: startet jede gewählte Skript-Version (CSV_to_xlsx_v*.py) so, wie sie per Doppelklick
+   läuft, in einem eigenen Ordner mit Kopien von CSV und Vorlage und misst die Laufzeit.
+
+Die Ergebnisse werden als Tabelle ausgegeben und je Dateigröße als eine JSON-Zeile an
+bench/ergebnisse.jsonl angehängt (Commit, Versionen, Zeiten in Sekunden), damit Läufe vergleichbar bleiben.
+Fehlende Testdaten werden mit generate_csv.py erzeugt.
+
+Aufruf:  python bench/benchmark.py --rows 1000 10000 --versions v4.2 v4.3
+"""
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import contextlib
+
+import pandas as pd
+import openpyxl
+
+import generate_csv
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+repo_dir = os.path.dirname(bench_dir)
+template_path = os.path.join(repo_dir, "TEMU.xlsx")
+package_dir = os.path.join(repo_dir, "temu_update")
+sys.path.insert(0, repo_dir)
+
+from temu_update import cells, config, dropdowns, output, records, rules, transform, xml_engine   # noqa: E402
+from temu_update.fields import projected_columns                                      # noqa: E402
+
+
+def prepare_modules():
+    """Schaltet Caches, Snapshots und Delta-Stand aus, damit jede Messung dieselbe Arbeit macht."""
+    config.configure(category_cache_path=None, template_snapshot_dir=None, delta_state_path=None)
+    rules.category_cache = {}
+    rules.category_fingerprint = rules.category_rules_fingerprint(rules.category_rules)
+    transform.delta_state = None
+    transform.delta_updates = []
+
+
+def timed(times, name, func, *args):
+    """Führt func aus, merkt sich die Laufzeit unter name und gibt das Ergebnis zurück."""
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, "w", encoding="utf-8")) as devnull:
+        try:
+            result = func(*args)
+        finally:
+            devnull.close()
+    times[name] = time.perf_counter() - started
+    return result
+
+
+def csv_positions(csv_file):
+    """Positionen der eingelesenen CSV-Spalten wie beim Lauf (csv_projection), None = alle."""
+    if not config.csv_projection:
+        return None
+    return projected_columns(records.read_csv_header(csv_file))[0]
+
+
+def run_stages(csv_file, work_dir, with_openpyxl):
+    """
+    Misst die einzelnen Schritte eines Laufs ohne Streaming; gibt {Stufe: Sekunden}, die Zahl der
+    geschriebenen Zeilen und den Speicher der eingelesenen Tabelle in MB zurück.
+    """
+    times = {}
+    stats = {}
+    df = timed(times, "lesen", lambda: next(transform.read_csv_chunks(csv_file, None, csv_positions(csv_file))))
+    df = timed(times, "spaltentypen", transform.use_categorical_dtypes, df, False)
+    table_mb = df.memory_usage(deep=True).sum() / 1e6
+    df = timed(times, "standardwerte", transform.apply_defaults, df, False)
+    df = timed(times, "laender", transform.translate_countries, df, False)
+    df = timed(times, "masse", transform.convert_dimensions, df, False)
+    df = timed(times, "artikel", transform.compute_artikel, df, False)
+    df = timed(times, "kategorien", transform.categorize, df, stats, False)
+    df = timed(times, "filter_kategorie", transform.filter_categories, df, stats, False)
+    df = timed(times, "filter_unvollstaendig", transform.filter_incomplete, df, stats, False)
+    plan = cells.compile_write_plan(df.columns)
+    col_order, columns = timed(times, "zellwerte", cells.prepare_cell_values, df, plan)
+    dropdowns.dropdown_findings = []
+    timed(times, "dropdown_pruefung", cells.check_dropdowns, dropdowns.load_dropdown_index(template_path),
+          col_order, columns, config.start_row)
+    rows = [(config.start_row + i, list(zip(col_order, values))) for i, values in enumerate(zip(*columns))]
+    timed(times, "schreiben_xml", xml_engine.write_workbook_xml, template_path,
+          os.path.join(work_dir, "stufen_xml.xlsx"), config.sheet_name, iter(rows))
+    if with_openpyxl:
+        config.configure(excel_engine="openpyxl")
+        try:
+            timed(times, "schreiben_openpyxl", output.write_output, template_path,
+                  os.path.join(work_dir, "stufen_openpyxl.xlsx"), iter(rows))
+        finally:
+            config.configure(excel_engine="xml")
+    times["summe"] = sum(times.values())
+    timed(times, "csv_weg_ohne_schreiben", run_records, csv_file)   # Vergleichswert, nicht in der Summe
+    return times, len(df), table_mb
+
+
+def run_records(csv_file):
+    """csv-Weg (ohne pandas): Lesen, alle Schritte und Zellwerte in einem Zug, ohne Schreiben."""
+    stats = {}
+    csv_columns = records.read_csv_header(csv_file)
+    positions = csv_positions(csv_file)
+    if positions is not None:
+        csv_columns = [csv_columns[i] for i in positions]
+    columns = records.record_columns(csv_columns)
+    blocks = records.iter_record_blocks(csv_file, columns, stats, positions)
+    rows = records.iter_record_rows(blocks, columns, stats)
+    return sum(1 for _ in rows)
+
+
+def run_full(script, csv_file, work_dir, timeout):
+    """
+    Startet eine Skript-Version wie beim Doppelklick (ENTER per stdin) in einem eigenen Ordner.
+    Gibt (Sekunden, ok) zurück; ok ist False bei Exit-Code, Zeitüberschreitung oder "--- FEHLER ---".
+    """
+    run_dir = os.path.join(work_dir, os.path.splitext(os.path.basename(script))[0])
+    os.makedirs(run_dir)
+    shutil.copy(script, run_dir)
+    if os.path.isdir(package_dir):
+        # Ab V4.4 ist das Skript nur die Startdatei, die Umwandlung steckt im Paket daneben
+        shutil.copytree(package_dir, os.path.join(run_dir, "temu_update"),
+                        ignore=shutil.ignore_patterns("__pycache__"))
+    shutil.copy(template_path, run_dir)
+    shutil.copy(csv_file, os.path.join(run_dir, "Temu_HasCat_IsTemu.csv"))
+    started = time.perf_counter()
+    try:
+        proc = subprocess.run([sys.executable, os.path.basename(script)], cwd=run_dir, input="\n\n\n",
+                              capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None, False
+    elapsed = time.perf_counter() - started
+    return elapsed, proc.returncode == 0 and "--- FEHLER ---" not in proc.stdout
+
+
+def pick_versions(names):
+    """Skript-Versionen zu den Kurznamen (z.B. "v4.3"); ohne Angabe alle CSV_to_xlsx_v*.py."""
+    scripts = sorted(glob.glob(os.path.join(repo_dir, "CSV_to_xlsx_v*.py")))
+    if not names:
+        return scripts
+    picked = []
+    for name in names:
+        path = os.path.join(repo_dir, f"CSV_to_xlsx_{name}.py")
+        if path not in scripts:
+            raise SystemExit(f"Unbekannte Version '{name}' (vorhanden: "
+                             + ", ".join(os.path.basename(s)[12:-3] for s in scripts) + ")")
+        picked.append(path)
+    return picked
+
+
+def git_commit():
+    """Aktueller Commit (kurz) oder None außerhalb eines Git-Repos."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=repo_dir, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(result):
+    """Gibt die Messwerte einer Dateigröße als Tabelle aus."""
+    print(f"\n{result['zeilen']} Zeilen ({result['csv_mb']} MB), {result['geschrieben']} geschrieben, "
+          f"Tabelle nach dem Einlesen {result['tabelle_mb']} MB")
+    for name, seconds in result["stufen"].items():
+        print(f"  {name:<24}{seconds:>9.3f} s")
+    for version, entry in result["gesamt"].items():
+        seconds = f"{entry['s']:>9.3f} s" if entry["s"] is not None else "  Timeout"
+        rate = f"  {result['zeilen'] / entry['s']:>8.0f} Zeilen/s" if entry["s"] else ""
+        print(f"  {'gesamt ' + version:<24}{seconds}{rate}{'' if entry['ok'] else '  FEHLER'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stufen- und Gesamtlaufzeiten der CSV-Umwandlung messen.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000], help="Zeilen je Testdatei")
+    parser.add_argument("--versions", nargs="*", help="Skript-Versionen für den Gesamtlauf, z.B. v4.2 v4.3 "
+                                                      "(Standard: alle; ohne Werte: kein Gesamtlauf)")
+    parser.add_argument("--openpyxl", action="store_true", help="Zusätzlich den openpyxl-Schreibweg messen")
+    parser.add_argument("--timeout", type=float, default=1800, help="Abbruch eines Gesamtlaufs nach Sekunden")
+    parser.add_argument("--data", default=os.path.join(bench_dir, "daten"), help="Ordner der Testdaten")
+    parser.add_argument("--results", default=os.path.join(bench_dir, "ergebnisse.jsonl"),
+                        help="Ergebnisdatei (JSON-Zeilen, wird fortgeschrieben)")
+    args = parser.parse_args()
+
+    versions = pick_versions(args.versions) if args.versions is None or args.versions else []
+    prepare_modules()
+    os.makedirs(args.data, exist_ok=True)
+    commit = git_commit()
+
+    for rows in args.rows:
+        csv_file = os.path.join(args.data, f"Temu_HasCat_IsTemu_{rows}.csv")
+        if not os.path.exists(csv_file):
+            print(f"Erzeuge {csv_file} ...")
+            generate_csv.generate(csv_file, rows)
+        with tempfile.TemporaryDirectory(prefix="temu_bench_") as work_dir:
+            stages, written, table_mb = run_stages(csv_file, work_dir, args.openpyxl)
+            full = {}
+            for script in versions:
+                seconds, ok = run_full(script, csv_file, work_dir, args.timeout)
+                full[os.path.basename(script)[12:-3]] = {"s": seconds and round(seconds, 3), "ok": ok}
+        result = {
+            "zeitpunkt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "openpyxl": openpyxl.__version__,
+            "cpu_kerne": os.cpu_count(),
+            "zeilen": rows,
+            "csv_mb": round(os.path.getsize(csv_file) / 1e6, 1),
+            "geschrieben": written,
+            "tabelle_mb": round(table_mb, 1),
+            "stufen": {name: round(seconds, 3) for name, seconds in stages.items()},
+            "gesamt": full,
+        }
+        print_result(result)
+        with open(args.results, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    print(f"\nErgebnisse angehängt an {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Erzeugt synthetische Plenty-Exporte im Format von Temu_HasCat_IsTemu.csv (Semikolon, UTF-8),
+z.B. mit 1.000, 10.000 und 100.000 Zeilen für Benchmarks.
+
+Die Daten sind zufällig, aber reproduzierbar (--seed) und enthalten alles, was die Umwandlung
+beschäftigt: HTML-Beschreibungen, <li>-Aufzählungspunkte, Bildlisten "url;0,url;1",
+Stückzahlen "12345:1;98765:2", deutsch/englische Stichwörter für category_rules,
+Garten/Haushalt-Produkte für den Filter sowie unvollständige Zeilen. Mit --extra-cols kommen
+zusätzliche, von der Umwandlung nicht benutzte Spalten dazu (wie in vielen Plenty-Exporten).
+
+Aufruf:  python bench/generate_csv.py --rows 1000 10000 100000 --out bench/daten
+"""
+import os
+import csv
+import random
+import argparse
+
+columns = [
+    "Warennummer", "SKU-ID", "Status", "Details", "Kategorie", "Kategoriename", "Produkttyp", "Produktname",
+    "Verkäufer Goods", "Verkäufer SKU", "Aktualisieren oder hinzufügen", "Marke", "Markenzeichen",
+    "Produktbeschreibung", "Aufzählungspunkt", "URL für Detailbilder", "1081 - Oberflächenbehandlungsprozess",
+    "1279 - Verwendungszweck", "Variationsdesign", "Farbe", "Material", "Kapazität", "Gewicht", "Menge", "Modell",
+    "URL für SKU-Bilder", "Anzahl", "Basispreis - EUR", "Referenzlink", "Listenpreis - EUR",
+    "Nicht verfügbar für Listenpreis", "Gewicht des Pakets - g", "Länge - mm", "Breite - mm", "Höhe - mm",
+    "SKU-Typ", "Einzeln verpackt", "Gesamtverpackungsanzahl", "Verpackungseinheit", "Nettoinhalt",
+    "Gesamtnettoinhalt", "Nettoinhaltseinheit", "Versandvorlage", "Ursprungsland/-region", "Herkunftsregion",
+    "Produktidentifikation", "Hersteller", "EU-Verantwortlicher", "Gesamtartikelanzahl",
+]
+
+# Stichwörter, die (teils absichtlich nicht) auf category_rules passen – gemischt Deutsch/Englisch
+keywords = [
+    "LED Scheinwerfer", "Headlight Set", "Nebelscheinwerfer", "Kühlergrill", "Front Grille", "Außenspiegel",
+    "Mirror Cap", "Frontlippe", "Front Lip Splitter", "Heckspoiler", "Rear Spoiler", "Wing", "Stoßdämpfer",
+    "Shock Absorber", "Gasdruckdämpfer", "Hitzeschutz Isolierung", "Noise Deadening", "Schlüssel Gehäuse",
+    "Key Fob Cover", "Remote Control", "Fensterheber", "Auspuff Endrohr", "Flexrohr", "Body Kit", "Stoßstange",
+    "Seitenschweller", "Innenraum Blende", "Fußmatten", "Universal Halter",
+]
+brands = ["Bosch", "Hella", "Maxton", "Valeo", "Febi", "Ridex", "NoName"]
+category_names = ["Auto & Motorrad", "Fahrzeugteile", "Haushalt & Wohnen", "Garten", "Beleuchtung", ""]
+countries = ["Deutschland", "Polen", "Türkei", "Taiwan", "China", "Italien"]
+
+
+def maybe(rng, value, empty_share):
+    """Gibt value zurück oder mit Wahrscheinlichkeit empty_share einen leeren Wert."""
+    return "" if rng.random() < empty_share else value
+
+
+def description(rng, keyword):
+    """HTML-Beschreibung, wie sie aus Plenty kommt (Absätze, Fett, Listen, Entities)."""
+    parts = [f"<p><b>{keyword}</b> passend für viele Modelle &amp; Baujahre.</p>"]
+    for _ in range(rng.randint(1, 5)):
+        parts.append("<p>" + " ".join(rng.choice(["Hochwertige", "Verarbeitung", "aus", "ABS", "Kunststoff",
+                                                  "einfache", "Montage", "ohne", "Bohren", "TÜV-frei", "quality",
+                                                  "fit", "OEM", "style"]) for _ in range(rng.randint(8, 40))) + "</p>")
+    if rng.random() < 0.5:
+        parts.append("<ul>" + "".join(f"<li>Merkmal {i}</li>" for i in range(rng.randint(1, 6))) + "</ul>")
+    return "\n".join(parts)
+
+
+def bullets(rng, keyword):
+    """Aufzählungspunkte als <li>-Liste, teils länger als die 700 Zeichen, die TEMU erlaubt."""
+    return "".join(f"<li>{keyword}: Vorteil {i} " + "x" * rng.choice([0, 0, 20, 60, 200, 900]) + "</li>"
+                   for i in range(rng.randint(0, 8)))
+
+
+def detail_images(rng, group):
+    """Bildliste im Plenty-Format "url;position,url;position"."""
+    return ",".join(f"https://cdn.example.com/item/{group}/{i}.jpg;{i}" for i in range(rng.randint(0, 30)))
+
+
+def bundle(rng):
+    """Stückzahlen "Artikel:Anzahl;Artikel:Anzahl" (mit gelegentlichen Fehlern)."""
+    if rng.random() < 0.05:
+        return rng.choice(["abc", "1:x", ""])
+    return ";".join(f"{rng.randint(10000, 99999)}:{rng.randint(1, 4)}" for _ in range(rng.randint(1, 3)))
+
+
+def product_row(rng, number, skus_per_item):
+    """Eine Zeile (SKU); mehrere aufeinanderfolgende SKUs teilen sich eine Warennummer."""
+    group = number // skus_per_item
+    keyword = rng.choice(keywords)
+    category_name = rng.choice(category_names)
+    row = {col: "" for col in columns}
+    row.update({
+        "Warennummer": str(100000 + group),
+        "SKU-ID": str(5000000 + number),
+        "Status": rng.choice(["aktiv", "aktiv", "inaktiv"]),
+        "Kategorie": maybe(rng, rng.choice(["21842", "22229", "Garten", "99999"]), 0.5),
+        "Kategoriename": category_name,
+        "Produkttyp": maybe(rng, "Autoteil", 0.3),
+        "Produktname": maybe(rng, f"{rng.choice(brands)} {keyword} für Modell {group % 97}", 0.02),
+        "Verkäufer Goods": str(100000 + group),
+        "Verkäufer SKU": f"SKU-{number:07d}",
+        "Aktualisieren oder hinzufügen": "Aktualisieren",
+        "Marke": maybe(rng, rng.choice(brands), 0.1),
+        "Produktbeschreibung": maybe(rng, description(rng, keyword), 0.05),
+        "Aufzählungspunkt": maybe(rng, bullets(rng, keyword), 0.1),
+        "URL für Detailbilder": maybe(rng, detail_images(rng, group), 0.1),
+        "Farbe": maybe(rng, rng.choice(["Schwarz", "Chrom", "Carbon-Optik", "Rot"]), 0.3),
+        "Material": maybe(rng, rng.choice(["ABS", "Aluminium", "Stahl", "Glas"]), 0.3),
+        "URL für SKU-Bilder": maybe(rng, f"https://cdn.example.com/sku/{number}.jpg", 0.03),
+        "Anzahl": maybe(rng, str(rng.randint(0, 50)), 0.2),
+        "Basispreis - EUR": f"{rng.uniform(5, 400):.2f}",
+        "Listenpreis - EUR": rng.choice([f"{rng.uniform(5, 400):.2f}"] * 18 + ["999.99", ""]),
+        "Gewicht des Pakets - g": str(rng.randint(50, 20000)),
+        "Länge - mm": maybe(rng, str(rng.randint(1, 2000)), 0.05),
+        "Breite - mm": maybe(rng, str(rng.randint(1, 1500)), 0.05),
+        "Höhe - mm": maybe(rng, str(rng.randint(1, 800)), 0.05),
+        "Ursprungsland/-region": maybe(rng, rng.choice(countries), 0.1),
+        "Produktidentifikation": maybe(rng, f"{4000000000000 + number}", 0.03),
+        "Hersteller": maybe(rng, rng.choice(brands), 0.2),
+        "Gesamtartikelanzahl": maybe(rng, bundle(rng), 0.3),
+    })
+    return [row[col] for col in columns]
+
+
+def extra_values(number, extra_cols):
+    """Werte der Zusatzspalten einer Zeile (ohne Zufall, damit die übrigen Daten gleich bleiben)."""
+    return [f"Zusatzwert {number % (7 + i)} für Feld {i + 1}" for i in range(extra_cols)]
+
+
+def generate(path, rows, seed=1, skus_per_item=3, extra_cols=0):
+    """Schreibt eine CSV mit rows Zeilen nach path (plus extra_cols unbenutzte Zusatzspalten)."""
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(columns + [f"Zusatzfeld {i + 1:02d}" for i in range(extra_cols)])
+        for number in range(rows):
+            writer.writerow(product_row(rng, number, skus_per_item) + extra_values(number, extra_cols))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetische Plenty-Exporte für Benchmarks erzeugen.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000], help="Zeilen je Datei")
+    parser.add_argument("--out", default=os.path.join("bench", "daten"), help="Zielordner")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert des Zufallsgenerators")
+    parser.add_argument("--extra-cols", type=int, default=0, help="Zusätzliche, nicht benutzte Spalten")
+    args = parser.parse_args()
+    os.makedirs(args.out, exist_ok=True)
+    for rows in args.rows:
+        path = os.path.join(args.out, f"Temu_HasCat_IsTemu_{rows}.csv")
+        generate(path, rows, args.seed, extra_cols=args.extra_cols)
+        print(f"{path}: {rows} Zeilen, {os.path.getsize(path) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
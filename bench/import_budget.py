@@ -0,0 +1,66 @@
+"""
+Prüft die Startzeit der Kommandozeile: --help und --check dürfen weder pandas noch openpyxl laden
+und müssen innerhalb des Zeitbudgets bleiben (Standard 0,5 s je Aufruf, gemessen als bester von
+mehreren Läufen in einem frischen Python-Prozess).
+
+Endet mit Exit-Code 1, wenn ein Aufruf das Budget überschreitet oder eine schwere Bibliothek lädt,
+und eignet sich damit auch als Prüfschritt vor einem Release.
+
+Aufruf:  python bench/import_budget.py --budget 0.5
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+repo_dir = os.path.dirname(bench_dir)
+launcher = os.path.join(repo_dir, "CSV_to_xlsx_v4.3.py")
+
+heavy_modules = ["pandas", "numpy", "openpyxl"]
+
+# Lädt die Kommandozeile und meldet, welche schweren Bibliotheken dabei mitgeladen wurden
+probe = (f"import sys; sys.path.insert(0, {repo_dir!r}); import temu_update.cli; "
+         f"print(','.join(name for name in {heavy_modules!r} if name in sys.modules))")
+
+
+def best_time(command, repeat):
+    """Schnellste Laufzeit von command in Sekunden und der Exit-Code des letzten Laufs."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        proc = subprocess.run(command, cwd=repo_dir, capture_output=True, text=True, encoding="utf-8",
+                              errors="replace")
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, proc.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startzeit von --help und --check gegen ein Budget prüfen.")
+    parser.add_argument("--budget", type=float, default=0.5, help="Höchstzeit je Aufruf in Sekunden")
+    parser.add_argument("--repeat", type=int, default=5, help="Läufe je Aufruf (der schnellste zählt)")
+    args = parser.parse_args()
+
+    failed = False
+    loaded = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True).stdout.strip()
+    if loaded:
+        print(f"FEHLER: import temu_update.cli lädt {loaded}")
+        failed = True
+    else:
+        print("import temu_update.cli lädt weder pandas noch numpy noch openpyxl")
+
+    # --check darf scheitern (z.B. ohne CSV im Repo-Ordner), gemessen wird nur die Zeit
+    for name, extra in (("--help", ["--help"]), ("--check", ["--check"])):
+        seconds, code = best_time([sys.executable, launcher] + extra, args.repeat)
+        over = seconds > args.budget
+        failed = failed or over
+        print(f"  {name:<10}{seconds:>7.3f} s  (Exit {code}){'  ÜBER BUDGET' if over else ''}")
+
+    print(f"\nBudget {args.budget:.2f} s: {'überschritten' if failed else 'eingehalten'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
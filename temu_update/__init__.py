@@ -0,0 +1,13 @@
+"""
+TEMU Produkt-Update: überträgt den Plenty-CSV-Export in die TEMU-Excel-Vorlage.
+
+Start per Doppelklick über CSV_to_xlsx_v4.3.py, auf der Kommandozeile mit `python -m temu_update --help`
+oder aus eigenem Code über main(). Die Einstellungen stehen in config.py, die Schritte in eigenen Modulen:
+transform (CSV umwandeln mit pandas), records (dasselbe ohne pandas), fields (gemeinsame Feldwerte),
+rules (Kategorie-Regeln), cells/xml_engine/workbook/output (Excel schreiben), dropdowns (Prüfung gegen die
+Auswahllisten der Vorlage), shards (mehrere Dateien), catalog (SQLite-Katalog), pipeline (Ablauf),
+report (Laufbericht), statefiles (Cache- und Stand-Dateien).
+"""
+from .cli import main
+
+__version__ = "4.4"
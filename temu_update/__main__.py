@@ -0,0 +1,6 @@
+"""Aufruf als `python -m temu_update [Optionen]`."""
+import sys
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+SQLite-Katalog (6.): die CSV einmal umgewandelt importieren und danach Teilmengen per SQL-Filter lesen.
+"""
+import os
+import sqlite3
+import contextlib
+import pandas as pd
+from . import config
+from .report import count_up, run_stage
+from .transform import filter_unchanged, read_csv_chunks, transform_chunk
+
+# 6. SQLite-Katalog: umgewandelte Produkte lokal speichern und per SQL-Filter auswählen
+catalog_table = "produkte"
+catalog_index_cols = {"SKU-ID": "idx_sku_id", "Warennummer": "idx_warennummer",
+                      "Kategorie": "idx_kategorie", "Marke": "idx_marke"}
+
+
+def import_catalog(csv_path, path, stats):
+    """
+    Liest die CSV blockweise ein, wendet alle Umwandlungen und Filter (2a bis 5.2) an und ersetzt
+    damit die Produkttabelle im Katalog. Danach werden die Indizes angelegt.
+    """
+    with contextlib.closing(sqlite3.connect(path)) as con:
+        columns = []
+        for number, chunk in enumerate(read_csv_chunks(csv_path, config.chunk_size)):
+            df = transform_chunk(chunk, stats, notes=number == 0)
+            df.to_sql(catalog_table, con, if_exists="replace" if number == 0 else "append", index=False)
+            columns = list(df.columns)
+            count_up(stats, "katalog_produkte", len(df))
+        for col, index_name in catalog_index_cols.items():
+            if col in columns:
+                con.execute(f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{catalog_table}" ("{col}")')
+        con.execute("ANALYZE")
+        con.commit()
+
+
+def read_catalog_chunks(path, where, chunk_size):
+    """
+    Liest die Produkte aus dem Katalog, die where erfüllen (in Import-Reihenfolge), als Folge von
+    DataFrames. Der Katalog wird nur lesend geöffnet, der Filter kann also nichts verändern.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Katalog '{path}' nicht gefunden – zuerst mit --import-catalog anlegen.")
+    query = f'SELECT * FROM "{catalog_table}" WHERE {where} ORDER BY rowid'
+    with contextlib.closing(sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)) as con:
+        try:
+            if not chunk_size:
+                yield pd.read_sql_query(query, con)
+                return
+            yield from pd.read_sql_query(query, con, chunksize=chunk_size)
+        except pd.errors.DatabaseError as e:
+            raise ValueError(f"Katalog-Abfrage fehlgeschlagen (Filter: {where}): {e}") from None
+
+
+def transform_catalog_chunk(df, stats, notes):
+    """Produkte aus dem Katalog sind bereits umgewandelt und gefiltert; es fehlt nur der Delta-Abgleich."""
+    count_up(stats, "gelesen", len(df))
+    return run_stage("delta", filter_unchanged, df, stats, notes)
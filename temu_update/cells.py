@@ -0,0 +1,125 @@
+"""
+Zellwerte (9.): aus den umgewandelten Blöcken werden die Werte je Excel-Spalte vorbereitet und als
+Zeilen (Excel-Zeile, [(Spaltennummer, Wert), ...]) an den Schreibweg übergeben.
+"""
+import numpy as np
+import pandas as pd
+from . import config, dropdowns
+from .fields import compile_write_plan
+from .report import count_up, measure_stage
+from .transform import transform_chunk
+
+
+# 9. Daten aus dem DataFrame in die Excel-Vorlage schreiben
+def map_unique(series, func):
+    """
+    Wendet func nur einmal je unterschiedlichem Wert der Spalte an und verteilt die Ergebnisse
+    wieder auf alle Zeilen (Varianten eines Artikels teilen sich meist dieselben Texte).
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    results = np.empty(len(uniques) + 1, dtype=object)
+    for i, value in enumerate(uniques):
+        results[i] = func(value)
+    results[-1] = func(None)  # Code -1 = fehlender Wert
+    return results[codes]
+
+
+def expand_unique(series, func, width):
+    """
+    Wie map_unique, aber für Spaltenbereiche: func liefert mehrere Werte je Rohwert. Ergebnis ist
+    eine Matrix (Zeilen x width), deren Spalten direkt die Zielspalten sind (aufgefüllt mit "").
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    table = np.full((len(uniques) + 1, width), "", dtype=object)
+    for i, value in enumerate(list(uniques) + [None]):  # None = fehlender Wert (Code -1)
+        items = func(value)[:width]
+        table[i, :len(items)] = items
+    return table[codes]
+
+
+def prepare_cell_values(df, plan):
+    """
+    Berechnet für einen Block alle fertigen Zellwerte spaltenweise nach dem Schreibplan.
+    Rückgabe: (Spaltennummern aufsteigend, Wertespalten in derselben Reihenfolge).
+    Spaltenbereiche (Aufzählungspunkte U–Z, Detailbilder AA–BX) werden dabei in einem Durchgang
+    auf ihre Einzelspalten verteilt, sodass der Schreiber nur noch Werte kopiert.
+    """
+    by_col = {}  # bei doppelt belegten Spalten gewinnt wie bisher die spätere Zuordnung
+    for csv_col, func, col_indices, is_range in plan:
+        if not is_range:
+            by_col[col_indices[0]] = map_unique(df[csv_col], func)
+            continue
+        matrix = expand_unique(df[csv_col], func, len(col_indices))
+        for j, col_idx in enumerate(col_indices):
+            by_col[col_idx] = matrix[:, j]
+    col_order = sorted(by_col)
+    return col_order, [by_col[col_idx] for col_idx in col_order]
+
+
+def check_dropdowns(index, col_order, columns, first_row):
+    """
+    Dropdown-Prüfung (9c.) eines Blocks spaltenweise: je Liste ein isin-Test über alle betroffenen Zeilen.
+    Abhängige Listen bekommen ihren Schlüssel je Zeile aus den Werten der anderen Spalten (Ersatzschlüssel,
+    wenn es den ersten nicht gibt). Ungültige Zellen landen in dropdowns.dropdown_findings.
+    """
+    lists = index["listen"]
+    list_keys = list(lists)
+    texts = {}
+
+    def text_of(pos):
+        if pos not in texts:
+            texts[pos] = pd.Series(columns[pos], dtype=object).fillna("").astype(str)
+        return texts[pos]
+
+    for pos, col_idx, variants in dropdowns.dropdown_checks(index, col_order):
+        values = text_of(pos)
+        filled = values != ""
+        if not filled.any():
+            continue
+        keys = None
+        for parts in reversed(variants):   # die erste Variante gewinnt, wenn es ihren Schlüssel gibt
+            key = pd.Series("", index=values.index, dtype=object)
+            for part in parts:
+                key = key + (part if isinstance(part, str) else text_of(part))
+            keys = key if keys is None else key.where(key.isin(list_keys), keys)
+        checked = filled & keys.isin(list_keys)
+        codes, uniques = pd.factorize(keys[checked])
+        checked_values = values[checked]
+        for i, key in enumerate(uniques):
+            part = checked_values[codes == i]
+            invalid = part[~part.isin(lists[key])]
+            dropdowns.dropdown_findings.extend((first_row + row, col_idx, value) for row, value in invalid.items())
+
+
+def iter_transformed_chunks(first_chunk, chunks, stats, transform=transform_chunk):
+    """Liefert den bereits umgewandelten ersten Block und danach jeden weiteren umgewandelten Block."""
+    yield first_chunk
+    del first_chunk  # Block freigeben, sobald er geschrieben ist
+    for chunk in chunks:
+        yield transform(chunk, stats, notes=False)
+
+
+def iter_excel_rows(frames, stats):
+    """
+    Liefert (Excel-Zeile, Zellen) für alle Zeilen aller Blöcke, beginnend bei start_row.
+    Zellen sind (Spaltennummer, Wert)-Paare, aufsteigend nach Spalte; die Zeilen entstehen
+    direkt aus den Wertespalten, ohne Zeilenobjekte oder Zelladressen als Text.
+    """
+    excel_row = config.start_row
+    plan = None
+    for df in frames:
+        if plan is None:
+            plan = compile_write_plan(df.columns)
+        with measure_stage("zellwerte") as entry:
+            col_order, columns = prepare_cell_values(df, plan)
+        count_up(entry, "zeilen_ein", len(df))
+        if dropdowns.dropdown_index is not None:
+            with measure_stage("dropdown_pruefung") as entry:
+                check_dropdowns(dropdowns.dropdown_index, col_order, columns, excel_row)
+            count_up(entry, "zeilen_ein", len(df))
+        for row_values in zip(*columns):
+            yield excel_row, zip(col_order, row_values)
+            excel_row += 1
+        count_up(stats, "geschrieben", len(df))
+        if config.chunk_size:
+            print(f"  -> {stats['gelesen']} Zeilen gelesen, {stats['geschrieben']} geschrieben.")
@@ -0,0 +1,220 @@
+"""
+Einstiegspunkt: interaktiver Start (Doppelklick) oder Kommandozeile ohne Rückfragen.
+
+Dieses Modul lädt nur die Standardbibliothek; pandas und openpyxl kommen erst mit der Umwandlung
+(pipeline), damit --help und --check sofort antworten.
+"""
+import os
+import sys
+import json
+import zipfile
+import argparse
+import contextlib
+from . import config
+
+
+def print_banner():
+    """Begrüßung und Kurzanleitung beim interaktiven Start."""
+    print("==============================================================")
+    print("              TEMU Produkt-Update Automatisierung             ")
+    print("==============================================================\n")
+
+    print("Achte darauf, dass **keine** der betroffenen Dateien geöffnet oder schreibgeschützt sind!\n")
+
+    print("TUTORIAL:")
+    print("- Exportiere die CSV über Plenty mit entsprechendem Filter")
+    print("- Führe die Python-Batch-Datei aus")
+    print("- Warte auf die Bestätigung des Skripts")
+    print("- Importiere die fertige Excel-Datei bei Temu")
+    print("- Kategorie prüfen/anpassen (Automatisierung aktiv) – fertig!\n")
+
+    print("==============================================================")
+
+
+def run_interactive(work_dir=None):
+    """
+    Start per Doppelklick: Anleitung zeigen, auf ENTER warten und mit den Einstellungen aus config.py
+    umwandeln. Fehler werden angezeigt; das Fenster bleibt bis zum nächsten ENTER offen.
+    """
+    if work_dir:
+        # Sicherstellen, dass das Skript-Verzeichnis als aktuelles Verzeichnis gesetzt ist
+        os.chdir(work_dir)
+    print_banner()
+    input("Drücke ENTER um fortzufahren ...")
+    print("==============================================================\n")
+    exit_code = 0
+    try:
+        from .pipeline import run_conversion, run_jobs
+        if config.jobs_path:
+            run_jobs(config.jobs_path)
+        else:
+            run_conversion()
+    except Exception as e:
+        # Fehlermeldung ausgeben
+        print("\n--- FEHLER ---")
+        print(str(e))
+        print("--------------\n")
+        exit_code = 1
+    finally:
+        input("Weiter mit ENTER ...")
+    return exit_code
+
+
+def check_setup():
+    """
+    Prüfung ohne Umwandlung (--check): Regeln kompilieren, CSV-Kopfzeile bzw. Katalog, Vorlage mit
+    Tabellenblatt und Zielordner. Fehlende CSV-Spalten sind nur ein Hinweis, wie bei der Umwandlung.
+    """
+    from .columns import column_mapping
+    from .fields import projected_columns
+    from .records import read_csv_header
+    from .rules import compiled_category_rules
+    from .xml_engine import find_sheet_part
+    result = {"regeln": len(compiled_category_rules)}
+    if config.catalog_filter:
+        if not os.path.exists(config.catalog_path):
+            raise FileNotFoundError(f"Katalog '{config.catalog_path}' nicht gefunden – "
+                                    "zuerst mit --import-catalog anlegen.")
+        result["katalog"] = config.catalog_path
+    else:
+        header = read_csv_header(config.csv_path)
+        result["csv_spalten"] = len(header)
+        # "Artikel" entsteht erst aus "Gesamtartikelanzahl"
+        result["fehlende_spalten"] = [col for col in column_mapping if col not in header and col != "Artikel"]
+        for col in result["fehlende_spalten"]:
+            print(f"Hinweis: Spalte '{col}' nicht in der CSV gefunden.")
+        if config.csv_projection:
+            result["uebersprungene_spalten"] = projected_columns(header)[1]
+            if result["uebersprungene_spalten"]:
+                print(f"Nicht benötigte Spalten (werden nicht eingelesen): "
+                      f"{', '.join(result['uebersprungene_spalten'])}")
+    with zipfile.ZipFile(config.excel_path) as zin:
+        result["tabellenblatt"] = find_sheet_part(zin, config.sheet_name)
+    target_dir = os.path.dirname(os.path.abspath(config.output_path or config.excel_path))
+    if not os.access(target_dir, os.W_OK):
+        raise PermissionError(f"Zielordner '{target_dir}' ist nicht beschreibbar.")
+    print(f"Prüfung erfolgreich: {result['regeln']} Kategorie-Regeln, Tabellenblatt '{config.sheet_name}' gefunden.")
+    return {"status": "ok", "pruefung": result}
+
+
+# 11. Kommandozeile: ohne Rückfragen, mit Exit-Code und JSON-Zusammenfassung auf stdout
+#     (pandas/openpyxl werden erst geladen, wenn wirklich umgewandelt wird)
+#     0 = erfolgreich, 1 = Fehler bei der Verarbeitung, 2 = ungültige Argumente,
+#     3 = Datei fehlt oder ist nicht zugreifbar (z.B. in Excel geöffnet)
+def parse_args(argv):
+    """Liest die Kommandozeilen-Argumente; Standardwerte sind die Einstellungen aus Schritt 1."""
+    parser = argparse.ArgumentParser(
+        description="TEMU Produkt-Update: überträgt den Plenty-CSV-Export ohne Rückfragen in die TEMU-Vorlage. "
+                    "Fortschritt geht nach stderr, die Zusammenfassung als JSON nach stdout.")
+    parser.add_argument("-i", "--input", default=config.csv_path, help="CSV-Datei (Standard: %(default)s)")
+    parser.add_argument("-t", "--template", default=config.excel_path, help="Excel-Vorlage (Standard: %(default)s)")
+    parser.add_argument("-o", "--output", default=config.output_path,
+                        help="Zieldatei (Standard: die Vorlage selbst wird aktualisiert)")
+    parser.add_argument("--sheet", default=config.sheet_name, help="Tabellenblatt (Standard: %(default)s)")
+    parser.add_argument("--start-row", type=int, default=config.start_row, help="Erste Datenzeile (Standard: %(default)s)")
+    parser.add_argument("--engine", choices=["xml", "openpyxl"], default=config.excel_engine, help="Schreibweg")
+    parser.add_argument("--chunk-size", type=int, default=config.chunk_size, help="Streaming-Modus: Zeilen je Block")
+    parser.add_argument("--csv-engine", choices=["pandas", "csv"], default=config.csv_engine,
+                        help="CSV-Weg: pandas (Standard) oder csv (ohne pandas, weniger Speicher)")
+    parser.add_argument("--shard-rows", type=int, default=config.shard_rows, help="Höchstens so viele Zeilen je Datei")
+    parser.add_argument("--shard-max-mb", type=float, default=config.shard_max_mb, help="Ungefähre Größe je Datei in MB")
+    parser.add_argument("--split-by-category", action="store_true", default=config.split_by_category,
+                        help="Eine Datei je Kategorie-ID")
+    parser.add_argument("--workers", type=int, default=config.shard_workers, help="Prozesse für mehrere Dateien")
+    parser.add_argument("--compression-level", type=int, choices=range(1, 10), default=config.compression_level,
+                        help="1 = am schnellsten ... 9 = kleinste Datei (Standard: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Kategorie-Cache und Vorlagen-Snapshot nicht verwenden")
+    parser.add_argument("--profile-rules", action="store_true", default=config.category_profile,
+                        help="Treffer und Zeit je Kategorie-Regel und Muster messen (Rangliste, langsamer)")
+    parser.add_argument("--delta", action="store_true", default=config.delta_mode,
+                        help="Nur neue oder seit dem letzten Lauf geänderte Produkte schreiben")
+    parser.add_argument("--full", action="store_true", help="Alle Produkte schreiben (hebt --delta auf)")
+    parser.add_argument("--catalog", metavar="DATEI", default=config.catalog_path,
+                        help="SQLite-Katalog (Standard: %(default)s)")
+    parser.add_argument("--import-catalog", action="store_true",
+                        help="CSV umgewandelt in den Katalog importieren (ersetzt den Inhalt), keine Excel-Datei")
+    parser.add_argument("--where", metavar="SQL", default=config.catalog_filter,
+                        help="Produkte aus dem Katalog statt aus der CSV, z.B. \"Marke = 'Bosch'\"")
+    parser.add_argument("--jobs", metavar="DATEI", default=config.jobs_path,
+                        help="JSON-Auftragsliste [{\"input\": ..., \"template\": ..., \"output\": ...}, ...]")
+    parser.add_argument("--parallel", type=int, default=config.job_workers, help="Aufträge, die gleichzeitig laufen")
+    parser.add_argument("--no-dropdown-check", action="store_true",
+                        help="Werte nicht mit den Auswahllisten der Vorlage ('Dropdown Lists') vergleichen")
+    parser.add_argument("--no-report", action="store_true",
+                        help="Keinen Laufbericht (<Zieldatei>_bericht.json) schreiben")
+    parser.add_argument("--check", action="store_true",
+                        help="Nur prüfen (Regeln, CSV-Kopfzeile bzw. Katalog, Vorlage, Zielordner), nichts schreiben")
+    parser.add_argument("--summary", metavar="DATEI", help="JSON-Zusammenfassung zusätzlich in diese Datei schreiben")
+    args = parser.parse_args(argv)
+    if args.start_row < 1:
+        parser.error("--start-row muss mindestens 1 sein")
+    return args
+
+
+def run_headless(argv):
+    """Einstiegspunkt der Kommandozeile: Einstellungen übernehmen, Umwandlung ausführen, Exit-Code liefern."""
+    args = parse_args(argv)
+    config.configure(**{
+        "csv_path": args.input,
+        "excel_path": args.template,
+        "output_path": args.output,
+        "sheet_name": args.sheet,
+        "start_row": args.start_row,
+        "excel_engine": args.engine,
+        "chunk_size": args.chunk_size,
+        "csv_engine": args.csv_engine,
+        "shard_rows": args.shard_rows,
+        "shard_max_mb": args.shard_max_mb,
+        "split_by_category": args.split_by_category,
+        "shard_workers": args.workers,
+        "compression_level": args.compression_level,
+        "category_cache_path": None if args.no_cache else config.category_cache_path,
+        "template_snapshot_dir": None if args.no_cache else config.template_snapshot_dir,
+        "delta_mode": args.delta and not args.full,
+        "run_report": config.run_report and not args.no_report,
+        "dropdown_check": config.dropdown_check and not args.no_dropdown_check,
+        "category_profile": args.profile_rules,
+        "catalog_path": args.catalog,
+        "catalog_filter": args.where,
+        "jobs_path": args.jobs,
+        "job_workers": args.parallel,
+    })
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            if args.check:
+                summary, exit_code = check_setup(), 0
+            elif args.import_catalog:
+                from .pipeline import run_catalog_import
+                summary, exit_code = run_catalog_import(), 0
+            elif config.jobs_path:
+                from .pipeline import run_jobs
+                summary = run_jobs(config.jobs_path)
+                exit_code = 0 if summary["status"] == "ok" else 1
+            else:
+                from .pipeline import run_conversion
+                summary, exit_code = run_conversion(), 0
+        except OSError as e:
+            print(f"FEHLER: {e}")
+            summary, exit_code = {"status": "fehler", "fehler": str(e)}, 3
+        except Exception as e:
+            print(f"FEHLER: {e}")
+            summary, exit_code = {"status": "fehler", "fehler": str(e)}, 1
+    summary["exit_code"] = exit_code
+    summary_json = json.dumps(summary, ensure_ascii=False)
+    print(summary_json)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(summary_json + "\n")
+    return exit_code
+
+
+def main(argv=None, work_dir=None):
+    """
+    Startet das Produkt-Update und gibt den Exit-Code zurück: ohne Argumente interaktiv (work_dir wird
+    dabei zum aktuellen Verzeichnis), mit Argumenten ohne Rückfragen (siehe parse_args).
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return run_headless(argv)
+    return run_interactive(work_dir)
@@ -0,0 +1,132 @@
+"""
+Spalten der Excel-Vorlage: Umrechnung Buchstaben <-> Nummern und das Spalten-Mapping von der CSV
+zu den Excel-Spalten. Ohne openpyxl, damit der XML-Schreibweg und die Prüfung schnell starten.
+"""
+import re
+
+column_letters = {}
+range_ref_re = re.compile(r"\$?([A-Z]{1,3})?\$?(\d+)?")
+
+
+def column_index(letters):
+    """Spaltennummer zu Spaltenbuchstaben, z.B. "A" -> 1, "AA" -> 27 (wie openpyxl column_index_from_string)."""
+    index = 0
+    for char in letters.upper():
+        if not "A" <= char <= "Z":
+            raise ValueError(f"Ungültige Spalte '{letters}'")
+        index = index * 26 + ord(char) - ord("A") + 1
+    if not 1 <= index <= 18278:
+        raise ValueError(f"Ungültige Spalte '{letters}'")
+    return index
+
+
+def col_letter_of(col_idx):
+    """Spaltenbuchstaben zur Spaltennummer, z.B. 27 -> "AA" (mit Zwischenspeicher, wird für jede Zelle gebraucht)."""
+    letter = column_letters.get(col_idx)
+    if letter is None:
+        if not 1 <= col_idx <= 18278:
+            raise ValueError(f"Ungültige Spaltennummer {col_idx}")
+        letter = ""
+        rest = col_idx
+        while rest:
+            rest, digit = divmod(rest - 1, 26)
+            letter = chr(ord("A") + digit) + letter
+        column_letters[col_idx] = letter
+    return letter
+
+
+def range_bounds(cell_range):
+    """
+    (min_col, min_row, max_col, max_row) eines Bereichs wie "E5:E2000", "B3" oder "A:C"; fehlende
+    Teile (ganze Spalten/Zeilen) sind None (wie openpyxl range_boundaries).
+    """
+    parts = cell_range.upper().split(":")
+    if len(parts) > 2:
+        raise ValueError(f"Ungültiger Bereich '{cell_range}'")
+    bounds = []
+    for part in parts:
+        match = range_ref_re.fullmatch(part)
+        if match is None or not any(match.groups()):
+            raise ValueError(f"Ungültiger Bereich '{cell_range}'")
+        col, row = match.groups()
+        bounds.append((column_index(col) if col else None, int(row) if row else None))
+    (min_col, min_row), (max_col, max_row) = bounds[0], bounds[-1]
+    return min_col, min_row, max_col, max_row
+
+
+def excel_col_range(start_col_letter, end_col_letter):
+    """Gibt eine Liste von Spaltenbuchstaben von start_col_letter bis end_col_letter zurück (inklusive)."""
+    start_idx = column_index(start_col_letter)
+    end_idx = column_index(end_col_letter)
+    return [col_letter_of(i) for i in range(start_idx, end_idx + 1)]
+
+
+# 7. Spalten-Mapping von CSV zu Excel-Spalten (Buchstaben)
+column_mapping = {
+    "Warennummer": "A",
+    "SKU-ID": "B",
+    "Status": "C",
+    "Details": "D",
+    "Kategorie": "E",
+    "Kategoriename": "F",
+    "Produkttyp": "G",
+    "Produktname": "L",
+    "Verkäufer Goods": "M",
+    "Verkäufer SKU": "N",
+    "Aktualisieren oder hinzufügen": "O",
+    "Marke": "R",
+    "Markenzeichen": "S",
+    "Produktbeschreibung": "T",
+    # Mehrere Aufzählungspunkte (bis zu 6 Bullet-Points U–Z)
+    "Aufzählungspunkt": excel_col_range("U", "Z"),
+    # Detailbilder-URLs (AA–BX)
+    "URL für Detailbilder": excel_col_range("AA", "BX"),
+    "1081 - Oberflächenbehandlungsprozess": "CB",
+    "1279 - Verwendungszweck": "CU",
+    "Variationsdesign": "DA",
+    "Farbe": "DB",
+    "Material": "DE",
+    "Kapazität": "DH",
+    "Gewicht": "DJ",
+    "Artikel": "DK",
+    "Menge": "DL",
+    "Modell": "DM",
+    "URL für SKU-Bilder": "DO",
+    "Anzahl": "DZ",
+    "Basispreis - EUR": "EA",
+    "Referenzlink": "EB",
+    "Listenpreis - EUR": "EC",
+    "Nicht verfügbar für Listenpreis": "ED",
+    "Gewicht des Pakets - g": "EE",
+    "Länge - mm": "EF",
+    "Breite - mm": "EG",
+    "Höhe - mm": "EH",
+    "SKU-Typ": "EI",
+    "Einzeln verpackt": "EJ",
+    "Gesamtverpackungsanzahl": "EK",
+    "Verpackungseinheit": "EL",
+    "Nettoinhalt": "EO",
+    "Gesamtnettoinhalt": "EP",
+    "Nettoinhaltseinheit": "EQ",
+    "Versandvorlage": "ET",
+    "Ursprungsland/-region": "EX",
+    "Herkunftsregion": "EY",
+    "SKU-Verpackungsinformationen (mit sichtbarem Etikett)": "EZ",
+    "Ursprungsetikett & Herstellerinformationen": "GS",
+    "Wurden Produkte unter dieser Waren-ID nach dem 13. Dezember 2024 in der EU (oder Nordirland) platziert?": "GY",
+    "Produktidentifikation": "GZ",
+    "Hersteller": "HA",
+    "EU-Verantwortlicher": "HB"
+}
+
+
+# 8. Alte Daten aus dem Excel-Blatt entfernen (ab start_row)
+def mapped_column_indices():
+    """Alle gemappten Excel-Spalten (einzeln und Bereiche) als Menge von Spaltennummern."""
+    used_cols = set()
+    for excel_cols in column_mapping.values():
+        if not excel_cols:
+            continue
+        for col in (excel_cols if isinstance(excel_cols, list) else [excel_cols]):
+            used_cols.add(col if isinstance(col, int) else column_index(col))
+    return used_cols
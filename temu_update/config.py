@@ -0,0 +1,97 @@
+"""
+Einstellungen des TEMU Produkt-Updates (1. Grundkonfiguration).
+
+Hier werden Pfade, Schreibweg, Caches und Modi eingestellt. Die Kommandozeile und die Auftragsliste
+überschreiben einzelne Werte zur Laufzeit per configure(); alle Schritte lesen sie als config.<name>.
+"""
+import os
+
+# 1. Grundkonfiguration
+csv_path = "Temu_HasCat_IsTemu.csv"   # Pfad zur CSV-Datei
+excel_path = "TEMU.xlsx"             # Pfad zur bestehenden Excel-Vorlage
+output_path = None                   # Zieldatei (None = die Vorlage selbst wird aktualisiert)
+sheet_name = "Template"              # Tabellenblattname in der Vorlage
+start_row = 5                        # Ab dieser Zeile werden Daten in Excel geschrieben
+
+# Cache für Kategorie-Zuordnungen (unveränderte Produkte werden nicht neu klassifiziert)
+category_cache_path = os.path.join(".temu_cache", "kategorien.json")   # None = Cache aus
+category_cache_max_entries = 200000  # Maximale Anzahl gespeicherter Texte
+category_cache_max_age_days = 30     # Einträge, die so lange nicht benutzt wurden, fliegen raus
+
+# Regel-Profil: je Kategorie-Regel und je Muster zählen, wie oft geprüft und getroffen wurde und wie lange
+# das dauerte (Rangliste am Ende). Kostet Zeit, daher nur zur Analyse; der Kategorie-Cache wird dabei umgangen
+category_profile = False             # True bzw. --profile-rules
+
+# Vorlagen-Snapshot: die zerlegte Vorlage wird je Inhalts-Hash zwischengespeichert und bei einer
+# neuen TEMU.xlsx automatisch neu erstellt
+template_snapshot_dir = os.path.join(".temu_cache", "vorlagen")   # None = Snapshot aus
+template_snapshot_max_files = 8      # Ältere Snapshots (z.B. von früheren Vorlagen) werden gelöscht
+
+# Schreibweg: "xml" = nur das Template-Blatt neu schreiben und alle übrigen Teile der Vorlage
+# unverändert übernehmen (schnell, konstanter Speicher); "openpyxl" = komplette Mappe laden/speichern
+excel_engine = "xml"
+compression_level = 6                # 1 = am schnellsten ... 9 = kleinste Datei (Nachtläufe z.B. mit 1)
+compression_threads = None           # Threads für die Kompression beim Speichern (None = alle CPU-Kerne)
+
+# Streaming-Modus: CSV blockweise lesen, verarbeiten und sofort schreiben (None = alles auf einmal)
+chunk_size = None                    # z.B. 5000 Zeilen je Block für sehr große Exporte
+
+# CSV-Weg: "pandas" = Tabellen je Block (alle Modi); "csv" = ohne pandas, Zeilen direkt mit dem csv-Modul
+# (weniger Speicher, schnellerer Start, gleiche Excel-Datei). Katalog, Aufteilen, Datei je Kategorie und
+# Regel-Profil nutzen immer pandas. Der Delta-Stand gilt je Weg; nach einem Wechsel wird einmal alles geschrieben
+csv_engine = "pandas"
+
+# Spalten mit wenigen unterschiedlichen Werten als pandas-Kategorie einlesen: jeder Wert liegt nur einmal im
+# Speicher, die Filter prüfen je Wert statt je Zeile. Weitere Textspalten werden automatisch umgestellt, wenn
+# höchstens dieser Anteil ihrer Werte verschieden ist (None = nur die Liste). Gilt für den pandas-Weg
+categorical_cols = ["Status", "Marke", "Hersteller", "EU-Verantwortlicher", "Versandvorlage",
+                    "Ursprungsland/-region", "SKU-Typ", "Verpackungseinheit"]
+categorical_max_share = 0.05         # z.B. 0.05 = höchstens 5 verschiedene Werte je 100 Zeilen
+
+# Spaltenauswahl: nur die CSV-Spalten einlesen, die Mapping, Kategorie-Regeln, Filter und Standardwerte brauchen;
+# die übersprungenen werden zu Beginn aufgelistet. Der Katalog-Import liest immer alle Spalten (für --where)
+csv_projection = True                # False = alle Spalten einlesen
+
+# Dropdown-Prüfung: die geschriebenen Werte werden mit den erlaubten Werten aus dem versteckten Blatt der Vorlage
+# verglichen (je Spalte mit Auswahlliste, abhängige Listen je Zeile, z.B. Herkunftsland je Kategorie); ungültige
+# Zellen werden mit Zeile und Spalte gemeldet, aber trotzdem geschrieben. Der Index liegt im Vorlagen-Snapshot
+dropdown_check = True                # False bzw. --no-dropdown-check = nicht prüfen
+dropdown_sheet_name = "Dropdown Lists"   # Blatt mit den Listen (Schlüssel in Spalte A, Werte ab Spalte C)
+dropdown_report_max = 10             # Höchstens so viele Beispiele je Spalte in der Ausgabe (alle im Laufbericht)
+
+# Aufteilen in mehrere Dateien (TEMU_Teil01.xlsx, TEMU_Teil02.xlsx, ...); beide None = eine Datei.
+# Alle SKUs einer Warennummer landen immer in derselben Datei. Die Vorlage selbst bleibt unverändert.
+shard_rows = None                    # Höchstens so viele Zeilen je Datei, z.B. 2000
+shard_max_mb = None                  # Ungefähre Zielgröße je Datei in MB, z.B. 20
+shard_workers = None                 # Prozesse, die gleichzeitig Dateien bauen (None = alle CPU-Kerne)
+
+# Eine Datei je zugewiesener Kategorie-ID (TEMU_21842.xlsx, TEMU_22229.xlsx, ...) plus
+# TEMU_ohne_Kategorie.xlsx für Produkte ohne passende Regel; lässt sich mit dem Aufteilen kombinieren
+split_by_category = False
+
+# Delta-Modus: nur neue oder seit dem letzten Lauf geänderte Produkte schreiben (Abgleich je SKU)
+delta_mode = False                   # True = nur Änderungen; False bzw. --full = alle Produkte
+delta_state_path = os.path.join(".temu_cache", "stand.json")   # Stand je Zieldatei: stand_<Ziel>_<Hash>.json (None = aus)
+
+# SQLite-Katalog: CSV einmal (bereits umgewandelt) importieren, danach Teilmengen per SQL-Filter schreiben
+catalog_path = "temu_katalog.sqlite"
+catalog_filter = None                # z.B. "Marke = 'Bosch' AND Kategorie = '21842'" (None = CSV lesen)
+
+# Mehrere Exporte in einem Lauf: JSON-Liste von Aufträgen [{"input": ..., "template": ..., "output": ...}, ...]
+jobs_path = None                     # z.B. "auftraege.json" (None = nur csv_path -> excel_path)
+job_workers = None                   # Aufträge, die gleichzeitig laufen (None = alle CPU-Kerne)
+
+# Laufbericht <Zieldatei>_bericht.json neben der Excel-Datei: Zeit, CPU-Zeit, Speicher und Zeilen je Schritt
+run_report = True
+
+
+def configure(**settings):
+    """Übernimmt geänderte Einstellungen für alle folgenden Schritte (z.B. aus der Kommandozeile)."""
+    unknown = sorted(name for name in settings if name not in setting_names)
+    if unknown:
+        raise ValueError("Unbekannte Einstellung(en): " + ", ".join(unknown))
+    globals().update(settings)
+
+
+setting_names = [name for name, value in list(globals().items())
+                 if not name.startswith("_") and name != "os" and not callable(value)]
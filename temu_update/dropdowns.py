@@ -0,0 +1,212 @@
+"""
+Dropdown-Prüfung (9c.): die geschriebenen Werte werden gegen die erlaubten Werte aus dem versteckten Blatt
+"Dropdown Lists" der Vorlage geprüft, bevor sie in die Excel-Datei gehen. Die Listen und die Datenüberprüfungen
+des Template-Blatts werden einmal je Vorlage ausgelesen und als Index im Snapshot-Ordner gespeichert.
+Nur Standardbibliothek; die Prüfung je Block steht in cells (pandas, isin) bzw. hier (csv-Weg).
+"""
+import os
+import re
+import html
+import json
+import hashlib
+import zipfile
+import xml.etree.ElementTree as ET
+from . import config
+from .report import count_up
+from .columns import col_letter_of, column_index, column_mapping, range_bounds
+from .xml_engine import find_sheet_part, read_template_snapshot, template_snapshot_path, write_template_snapshot
+
+# 9c. Dropdown-Prüfung. Die Datenüberprüfungen der Vorlage sehen so aus:
+#     INDIRECT(VLOOKUP("t_8_"&INDEX($E:$E, ROW())&"_"&"Hersteller",'Dropdown Lists'!A:B,2,0))
+#     Der Schlüssel aus Text und Werten anderer Spalten derselben Zeile steht in Spalte A des Listenblatts,
+#     die erlaubten Werte ab Spalte C in derselben Zeile.
+ns_main = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+data_validation_re = re.compile(r"<dataValidation\b([^>]*)>(.*?)</dataValidation>", re.S)
+formula1_re = re.compile(r"<formula1>(.*?)</formula1>", re.S)
+key_part_re = re.compile(r'"((?:[^"]|"")*)"|INDEX\(\$([A-Z]+):\$[A-Z]+,\s*ROW\(\)\)')
+cell_col_re = re.compile(r"[A-Z]+")
+
+dropdown_index = None                # Index der Vorlage dieses Laufs (None = keine Prüfung)
+dropdown_findings = []               # Ungültige Zellen der aktuellen Datei: (Excel-Zeile, Spaltennummer, Wert)
+dropdown_results = {}                # Datei -> ungültige Zellen (für die Ausgabe nach dem Schreiben)
+dropdown_indexes = {}                # Index je (Pfad, Blatt, Listenblatt, Änderungszeit, Größe) im Prozess
+
+
+def read_shared_strings(zin):
+    """Texte aus xl/sharedStrings.xml in Index-Reihenfolge (Formatierungsläufe zusammengefügt)."""
+    if "xl/sharedStrings.xml" not in zin.namelist():
+        return []
+    root = ET.fromstring(zin.read("xl/sharedStrings.xml"))
+    return ["".join(t.text or "" for t in [*item.findall(f"{ns_main}t"), *item.findall(f"{ns_main}r/{ns_main}t")])
+            for item in root.findall(f"{ns_main}si")]
+
+
+def read_list_rows(zin, part_name, shared):
+    """Liefert je Zeile des Listenblatts (Schlüssel aus Spalte A, [Werte ab Spalte C])."""
+    root = ET.fromstring(zin.read(part_name))
+    for row in root.iter(f"{ns_main}row"):
+        key = None
+        values = []
+        for cell in row.findall(f"{ns_main}c"):
+            kind = cell.get("t")
+            if kind == "inlineStr":
+                text = "".join(t.text or "" for t in cell.iter(f"{ns_main}t"))
+            else:
+                value = cell.find(f"{ns_main}v")
+                if value is None or value.text is None:
+                    continue
+                text = shared[int(value.text)] if kind == "s" else value.text
+            col = cell_col_re.match(cell.get("r", "")).group(0) if cell.get("r") else None
+            if col == "A":
+                key = text
+            elif col not in ("A", "B") and text != "":
+                values.append(text)
+        if key:
+            yield key, values
+
+
+def parse_list_formula(formula, list_sheet):
+    """
+    Zerlegt eine Listen-Formel in ihre Schlüssel: je VLOOKUP (IFERROR = Ersatzschlüssel) eine Liste aus Texten
+    und Spaltennummern, deren Zeilenwert eingesetzt wird. Liefert [] für Formeln ohne das Listenblatt.
+    """
+    lookup_re = re.compile(r"VLOOKUP\((.*?),\s*'?" + re.escape(list_sheet) + r"'?!\$?A:\$?B,\s*2,\s*(?:0|FALSE)\)")
+    keys = []
+    for match in lookup_re.finditer(formula):
+        parts = []
+        for text, col in key_part_re.findall(match.group(1)):
+            parts.append(column_index(col) if col else text.replace('""', '"'))
+        keys.append(parts)
+    return keys
+
+
+def extract_dropdown_index(zin, sheet, list_sheet):
+    """
+    Liest die Listen (Schlüssel -> erlaubte Werte) und die Datenüberprüfungen des Blatts sheet
+    (Spaltennummer -> Schlüssel-Varianten). Rückgabe als JSON-fähiges dict.
+    """
+    shared = read_shared_strings(zin)
+    lists = dict(read_list_rows(zin, find_sheet_part(zin, list_sheet), shared))
+    xml = zin.read(find_sheet_part(zin, sheet)).decode("utf-8")
+    columns = {}
+    start = xml.find("<dataValidations")
+    for attrs, body in data_validation_re.findall(xml, start if start >= 0 else len(xml)):
+        if 'type="list"' not in attrs:
+            continue
+        formula = formula1_re.search(body)
+        sqref = re.search(r'sqref="([^"]*)"', attrs)
+        keys = parse_list_formula(html.unescape(formula.group(1)), list_sheet) if formula and sqref else []
+        if not keys:
+            continue
+        for cell_range in sqref.group(1).split():
+            min_col, _, max_col, _ = range_bounds(cell_range)
+            for col_idx in range(min_col, max_col + 1):
+                columns[str(col_idx)] = keys
+    return {"spalten": columns, "listen": lists}
+
+
+def load_dropdown_index(template_path, save_snapshot=True, sheet=None):
+    """
+    Index der Dropdown-Listen der Vorlage für das Blatt sheet (None = sheet_name): {"spalten": {Spaltennummer:
+    Schlüssel-Varianten}, "listen": {Schlüssel: frozenset erlaubter Werte}}. Zwischengespeichert im Prozess und
+    als Snapshot je Inhalts-Hash der Vorlage; None, wenn die Vorlage kein Listenblatt hat.
+    """
+    sheet = sheet or config.sheet_name
+    stat = os.stat(template_path)
+    cache_key = (os.path.abspath(template_path), sheet, config.dropdown_sheet_name, stat.st_mtime_ns, stat.st_size)
+    if cache_key not in dropdown_indexes:
+        snapshot_path = None
+        index = None
+        if config.template_snapshot_dir:
+            sheets = f"{sheet}\n{config.dropdown_sheet_name}"
+            sheet_key = hashlib.blake2b(sheets.encode("utf-8"), digest_size=4).hexdigest()
+            snapshot_path = template_snapshot_path(template_path, f"{sheet_key}.dropdowns.json")
+            index = read_template_snapshot(snapshot_path, json.load)
+        if index is None:
+            try:
+                with zipfile.ZipFile(template_path) as zin:
+                    index = extract_dropdown_index(zin, sheet, config.dropdown_sheet_name)
+            except ValueError as e:
+                print(f"Hinweis: {e} Dropdown-Prüfung übersprungen.\n")
+                index = {"spalten": {}, "listen": {}}
+            if snapshot_path and save_snapshot:
+                write_template_snapshot(snapshot_path, lambda data, f: f.write(
+                    json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")), index)
+        dropdown_indexes[cache_key] = {
+            "spalten": {int(col_idx): keys for col_idx, keys in index["spalten"].items()},
+            "listen": {key: frozenset(values) for key, values in index["listen"].items()},
+        } if index["spalten"] else None
+    return dropdown_indexes[cache_key]
+
+
+def dropdown_checks(index, col_order):
+    """
+    Prüfschritte für Zeilen mit den Spalten col_order: [(Position, Spaltennummer, Schlüssel-Varianten), ...].
+    In den Schlüsseln stehen statt Spaltennummern die Positionen in col_order; nicht geschriebene Spalten
+    sind leer ("").
+    """
+    positions = {col_idx: pos for pos, col_idx in enumerate(col_order)}
+    checks = []
+    for pos, col_idx in enumerate(col_order):
+        keys = index["spalten"].get(col_idx)
+        if keys:
+            checks.append((pos, col_idx, [[positions.get(part, "") if isinstance(part, int) else part
+                                           for part in parts] for parts in keys]))
+    return checks
+
+
+def cell_text(value):
+    """Zellwert als Text, wie ihn die Formel in Excel sieht (leer für None)."""
+    return "" if value is None else str(value)
+
+
+def check_dropdown_rows(index, checks, first_row, rows):
+    """
+    csv-Weg: prüft die Zeilen eines Blocks (Werte in der Reihenfolge von col_order) und merkt sich
+    ungültige Zellen in dropdown_findings. Leere Zellen sind erlaubt (allowBlank), Zeilen ohne passende
+    Liste (z.B. Kategorie ohne eigene Herkunftsliste) werden nicht geprüft.
+    """
+    lists = index["listen"]
+    for offset, values in enumerate(rows):
+        for pos, col_idx, variants in checks:
+            value = cell_text(values[pos])
+            if value == "":
+                continue
+            for parts in variants:
+                key = "".join(part if isinstance(part, str) else cell_text(values[part]) for part in parts)
+                if key in lists:
+                    if value not in lists[key]:
+                        dropdown_findings.append((first_row + offset, col_idx, value))
+                    break
+
+
+def print_dropdown_report(results, stats):
+    """
+    Gibt die ungültigen Zellen je Datei und Spalte aus (höchstens dropdown_report_max Beispiele je Spalte),
+    zählt sie in stats und liefert sie für den Laufbericht. results: {Datei: [(Excel-Zeile, Spaltennummer, Wert), ...]}.
+    """
+    names = {}
+    for csv_col, excel_col in column_mapping.items():
+        if isinstance(excel_col, str) and ":" not in excel_col:
+            names[column_index(excel_col)] = csv_col
+    total = sum(len(findings) for findings in results.values())
+    count_up(stats, "dropdown_ungueltig", total)
+    if not total:
+        print(f"Dropdown-Prüfung: alle Werte stehen in den Listen der Vorlage ('{config.dropdown_sheet_name}').\n")
+        return []
+    print(f"Dropdown-Prüfung: {total} Werte stehen nicht in den Listen der Vorlage ('{config.dropdown_sheet_name}'):")
+    report = []
+    for path, findings in results.items():
+        by_col = {}
+        for excel_row, col_idx, value in sorted(findings):
+            by_col.setdefault(col_idx, []).append((excel_row, value))
+        for col_idx in sorted(by_col):
+            letter = col_letter_of(col_idx)
+            field = names.get(col_idx, "")
+            print(f"  {os.path.basename(path)}, Spalte {letter} ({field}): {len(by_col[col_idx])} ungültig")
+            for excel_row, value in by_col[col_idx][:config.dropdown_report_max]:
+                print(f"    Zeile {excel_row}: '{value}'")
+            report.extend({"datei": path, "zeile": excel_row, "spalte": letter, "feld": field, "wert": value}
+                          for excel_row, value in by_col[col_idx])
+    print()
+    return report
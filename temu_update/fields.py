@@ -0,0 +1,186 @@
+"""
+Feldwerte: Konstanten und Umwandlungen einzelner Werte, die der pandas-Weg (transform, cells) und der
+csv-Weg (records) gemeinsam benutzen. Nur Standardbibliothek.
+"""
+import re
+import math
+from .columns import column_index, column_mapping
+
+
+def is_missing(value):
+    """Fehlender Wert: None oder NaN (so kommen leere CSV-Felder aus pandas bzw. dem csv-Weg)."""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+# 3. Mapping für Länder (Ursprungsland/-region)
+country_map = {
+    "Taiwan": "TW",
+    "Deutschland": "Germany",
+    "Polen": "Poland",
+    "Türkei": "Türkiye"
+}
+
+# Maße von mm in cm umrechnen (Minimum 1 cm)
+mm_to_cm_cols = ["Länge - mm", "Breite - mm", "Höhe - mm"]
+
+
+# 4. Gesamtanzahl Artikel aus Stückzahlen berechnen
+def sum_stueckzahlen(value):
+    """
+    Erwartet einen String im Format 'xxxx:1;yyyy:2;...'
+    Gibt mindestens 1 zurück (Fallback).
+    """
+    if is_missing(value) or str(value).strip() == "":
+        return 1
+    total = 0
+    try:
+        parts = str(value).split(";")
+        for part in parts:
+            if ":" not in part:
+                continue
+            _, qty = part.split(":", 1)
+            qty = qty.strip()
+            if qty.isdigit():
+                total += int(qty)
+    except Exception:
+        return 1  # Fallback bei Fehler
+    return total if total >= 1 else 1
+
+
+# 5. Texte für die Kategorie-Automatisierung und interne Spalte mit der per Regel zugewiesenen Kategorie-ID
+category_text_cols = ["Produktbeschreibung", "Produktname", "Kategoriename"]
+category_rule_col = "Kategorie (Regel)"
+
+# 5.1 Filter: Produkte aus bestimmten Kategorien nicht übertragen (z.B. 'Garten' oder 'Haushalt')
+filter_terms = ["garten", "haushalt"]
+
+# 5.2 Produkte ohne wichtige Angaben (Identifikation, Preis, Bild) ignorieren; diese Werte gelten als leer
+required_cols = ["Produktidentifikation", "Listenpreis - EUR", "URL für SKU-Bilder"]
+placeholder_values = ["999.99", "n/a", "na", "-", "null", "none"]
+
+# 5.3 Delta-Modus: erste nicht leere Spalte identifiziert das Produkt
+delta_key_cols = ["SKU-ID", "Verkäufer SKU"]
+
+# 9b. Aufteilen in mehrere Dateien: Zeilen mit gleicher Warennummer werden nie getrennt
+shard_group_col = "Warennummer"
+
+# 2. Spaltenauswahl: außer den gemappten Spalten lesen die Schritte nur diese CSV-Spalten
+step_cols = ["Anzahl", "Nicht verfügbar für Listenpreis", "Ursprungsland/-region", *mm_to_cm_cols,
+             "Gesamtartikelanzahl", "Kategorie", *category_text_cols, *required_cols, *delta_key_cols,
+             shard_group_col]
+
+
+def projected_columns(csv_columns):
+    """
+    Teilt die CSV-Spalten in benötigte und übersprungene: benötigt sind die Schlüssel von column_mapping und
+    step_cols (Standardwerte, Umrechnungen, Texte für category_rules, Filter, Delta, Aufteilen).
+    Rückgabe: (Positionen der benötigten Spalten, Namen der übersprungenen), jeweils in CSV-Reihenfolge.
+    """
+    needed = set(column_mapping) | set(step_cols)
+    positions = [i for i, name in enumerate(csv_columns) if name in needed]
+    skipped = [name for name in csv_columns if name not in needed]
+    return positions, skipped
+
+
+# Hilfsfunktionen für Texte, Aufzählungspunkte und Bildlisten
+def clean_richtext(value):
+    """Entfernt HTML-/Markdown-Tags und reduziert überflüssige Leerzeichen."""
+    if is_missing(value):
+        return ""
+    text = str(value)
+    # HTML-Tags entfernen
+    text = re.sub(r"<.*?>", "", text)
+    # Markdown-Syntax (fett/kursiv/Listen/Heading) entfernen
+    text = re.sub(r"[*`#>]", "", text)
+    # HTML-Entities (&nbsp; &amp; etc.) durch Leerzeichen ersetzen
+    text = re.sub(r"&[a-zA-Z0-9#]+;", " ", text)
+    # Mehrfache Leerzeichen reduzieren
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def limit_length(value, max_length):
+    """Begrenzt die Textlänge auf max_length Zeichen."""
+    if value is None:
+        return ""
+    text = str(value)
+    return text[:max_length] if len(text) > max_length else text
+
+
+def parse_bullets(raw):
+    """
+    Konvertiert HTML-Aufzählungen (<li>, <br>) in eine Liste einzelner Bulletpoint-Zeilen.
+    """
+    if is_missing(raw):
+        return []
+    text = str(raw)
+    # HTML-Zeilenumbrüche und Listenelemente in Zeilenumbrüche umwandeln
+    text = re.sub(r"(?i)<br\s*/?>", "\n", text)     # <br> zu newline
+    text = re.sub(r"(?i)</li\s*>", "\n", text)      # </li> zu newline
+    text = re.sub(r"(?i)<li\s*>", "", text)         # führendes <li> entfernen
+    # Restliche HTML-Tags entfernen
+    text = re.sub(r"<.*?>", "", text)
+    # In Zeilen splitten und trimmen
+    lines = [ln.strip() for ln in text.split("\n")]
+    return [ln for ln in lines if ln]  # leere Zeilen entfernen
+
+
+def parse_detail_images(raw):
+    """
+    Zerlegt den Detailbild-String aus der CSV (Format: 'url;0,url;1,...') in eine Liste von URLs.
+    """
+    if is_missing(raw):
+        return []
+    text = str(raw).strip()
+    if not text:
+        return []
+    items = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        url = part.split(";", 1)[0].strip()
+        if url:
+            items.append(url)
+    return items
+
+
+def bullet_slots(raw):
+    """Aufzählungspunkte -> bereinigte Einzelwerte, Länge auf 700 Zeichen begrenzt."""
+    return [limit_length(clean_richtext(item), 700) for item in parse_bullets(raw)]
+
+
+def detail_image_slots(raw):
+    """Detailbild-String 'url;0,url;1,...' -> bereinigte Einzel-URLs."""
+    return [clean_richtext(item) for item in parse_detail_images(raw)]
+
+
+# Spalten, die auf einen Bereich von Excel-Spalten verteilt werden
+range_transforms = {
+    "Aufzählungspunkt": bullet_slots,
+    "URL für Detailbilder": detail_image_slots,
+}
+
+
+def compile_write_plan(columns):
+    """
+    Übersetzt column_mapping einmalig in einen Schreibplan
+    [(CSV-Spalte, Umwandlung, [Spaltennummern], ist Spaltenbereich), ...]
+    für die vorhandenen CSV-Spalten. Spaltenbuchstaben werden nur hier in Spaltennummern umgerechnet.
+    """
+    plan = []
+    for csv_col, excel_cols in column_mapping.items():
+        if csv_col not in columns or not excel_cols:
+            continue
+        if isinstance(excel_cols, list):
+            func = range_transforms.get(csv_col, lambda raw: [])
+            plan.append((csv_col, func, [column_index(col) for col in excel_cols], True))
+            continue
+        if csv_col == "URL für SKU-Bilder":
+            # Länge der SKU-Bild URL auf 512 Zeichen begrenzen
+            func = lambda raw: limit_length(clean_richtext(raw), 512)
+        else:
+            func = clean_richtext
+        col_idx = excel_cols if isinstance(excel_cols, int) else column_index(excel_cols)
+        plan.append((csv_col, func, [col_idx], False))
+    return plan
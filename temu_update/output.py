@@ -0,0 +1,30 @@
+"""
+Ausgabe: Schreibweg wählen (XML oder openpyxl). Ohne pandas, damit auch der csv-Weg (records) sie
+benutzen kann; mehrere Dateien baut shards.
+"""
+import os
+import sys
+from . import config
+from .xml_engine import write_workbook_xml
+
+
+def write_output(template_path, output_path, rows):
+    """
+    Schreibt die Zeilen aus iter_excel_rows mit dem eingestellten Schreibweg (excel_engine)
+    in die Vorlage und speichert das Ergebnis unter output_path.
+    """
+    if config.excel_engine == "xml":
+        print("Öffne Excel-Datei (direkter XML-Schreibweg)...")
+        print(f"Lösche alte Einträge und schreibe neue Daten ab Zeile {config.start_row}...")
+        write_workbook_xml(template_path, output_path, config.sheet_name, rows)
+        print("Schreiben der neuen Daten abgeschlossen.\n")
+        return
+    from .workbook import write_workbook_openpyxl   # openpyxl wird nur für diesen Schreibweg geladen
+    write_workbook_openpyxl(template_path, output_path, rows)
+
+
+# Worker-Prozesse (Aufteilen in mehrere Dateien, Auftragsliste) übernehmen die Einstellungen des Hauptprozesses
+def init_output_worker(settings):
+    """Übernimmt die Einstellungen des Hauptprozesses; Ausgaben der Worker werden unterdrückt."""
+    config.configure(**settings)
+    sys.stdout = open(os.devnull, "w")
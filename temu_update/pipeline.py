@@ -0,0 +1,394 @@
+"""
+Ablauf (10.): CSV oder Katalog lesen, umwandeln, schreiben und Laufbericht; Auftragslisten (10a.).
+pandas und die Module des pandas-Wegs werden erst geladen, wenn dieser Weg benutzt wird; der csv-Weg
+(records) kommt ohne pandas aus.
+"""
+import os
+import json
+import hashlib
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from . import config, dropdowns, records, rules
+from .dropdowns import load_dropdown_index, print_dropdown_report
+from .fields import projected_columns
+from .output import init_output_worker, write_output
+from .report import (count_up, measure_chunks, measure_stage, peak_memory_mb, print_transform_summary,
+                     run_report_path, stage_report)
+from .rules import category_rules, category_rules_fingerprint, load_category_cache, store_category_cache
+from . import xml_engine
+from .xml_engine import load_template_sheet
+
+
+def write_run_report(path, summary, cpu_started, invalid_cells=()):
+    """
+    Schreibt die Zusammenfassung eines Laufs samt den Messwerten je Schritt und den ungültigen Zellen
+    der Dropdown-Prüfung als JSON nach path.
+    """
+    report = dict(summary)
+    report.update({
+        "zeitpunkt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "eingabe": f"{config.catalog_path} ({config.catalog_filter})" if config.catalog_filter else config.csv_path,
+        "vorlage": config.excel_path,
+        "schreibweg": config.excel_engine,
+        "cpu_s": round(time.process_time() - cpu_started, 3),
+        "peak_mb": peak_memory_mb(),
+        "stufen": {name: {key: round(value, 3) if isinstance(value, float) else value
+                          for key, value in entry.items()}
+                   for name, entry in stage_report.items()},
+    })
+    if invalid_cells:
+        report["dropdown_ungueltig"] = list(invalid_cells)
+    if config.category_profile:
+        from .transform import rule_profile
+        report["regelprofil"] = [dict(entry, zeit_s=round(entry["zeit_s"], 4),
+                                      muster=[dict(pattern, zeit_s=round(pattern["zeit_s"], 4))
+                                              for pattern in entry["muster"]])
+                                 for entry in rule_profile]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load_category_state():
+    """Lädt den Kategorie-Cache für einen neuen Lauf (leer, wenn der Cache aus ist)."""
+    rules.category_fingerprint = category_rules_fingerprint(category_rules)
+    rules.category_cache = (load_category_cache(config.category_cache_path, rules.category_fingerprint)
+                            if config.category_cache_path else {})
+
+
+def load_dropdown_state(target_path):
+    """Lädt den Index der Dropdown-Listen für einen neuen Lauf (None, wenn die Prüfung aus ist)."""
+    dropdowns.dropdown_findings = []
+    dropdowns.dropdown_results = {}
+    in_place = os.path.abspath(config.excel_path) == os.path.abspath(target_path)
+    dropdowns.dropdown_index = load_dropdown_index(config.excel_path, not in_place) if config.dropdown_check else None
+
+
+# 10. Ablauf: CSV lesen und umwandeln, Vorlage öffnen, Daten schreiben, speichern
+def run_catalog_import():
+    """Importiert csv_path umgewandelt in den SQLite-Katalog und gibt eine Zusammenfassung zurück."""
+    from . import transform
+    from .catalog import import_catalog
+    from .transform import reset_rule_profile
+    started = time.time()
+    stats = {}
+    load_category_state()
+    transform.delta_state = None  # Der Delta-Abgleich passiert erst beim Schreiben aus dem Katalog
+    reset_rule_profile()
+
+    print(f"Importiere '{config.csv_path}' in den Katalog '{config.catalog_path}' ...")
+    import_catalog(config.csv_path, config.catalog_path, stats)
+    print_transform_summary(stats)
+    store_category_cache()
+    print(f"Katalog aktualisiert: {stats.get('katalog_produkte', 0)} Produkte in '{config.catalog_path}'.\n")
+    return {"status": "ok", "katalog": config.catalog_path, "zaehler": stats,
+            "dauer_s": round(time.time() - started, 3)}
+
+
+def delta_state_file(target_path):
+    """
+    Stand-Datei des Delta-Modus für eine Zieldatei, z.B. .temu_cache/stand_TEMU_1a2b3c4d.json (None = aus).
+    Jede Zieldatei hat ihren eigenen Stand: ein Produkt gilt nur als unverändert, wenn es schon in diese Datei
+    geschrieben wurde.
+    """
+    if not config.delta_state_path:
+        return None
+    target = os.path.normcase(os.path.abspath(target_path))
+    digest = hashlib.blake2b(target.encode("utf-8"), digest_size=4).hexdigest()
+    root, ext = os.path.splitext(config.delta_state_path)
+    return f"{root}_{os.path.splitext(os.path.basename(target_path))[0]}_{digest}{ext}"
+
+
+def select_csv_columns(csv_columns, stats):
+    """
+    Spaltenauswahl (csv_projection): gibt die Positionen der benötigten CSV-Spalten zurück (None = alle
+    einlesen) und listet die übersprungenen auf.
+    """
+    if not config.csv_projection:
+        return None
+    positions, skipped = projected_columns(csv_columns)
+    if skipped:
+        count_up(stats, "spalten_uebersprungen", len(skipped))
+        print(f"Nicht benötigte Spalten übersprungen ({len(skipped)}): {', '.join(skipped)}\n")
+    return positions
+
+
+def use_csv_engine():
+    """
+    True, wenn der csv-Weg (ohne pandas) benutzt wird: csv_engine = "csv" und nur eine Zieldatei
+    aus der CSV. Für Katalog, Aufteilen, Datei je Kategorie und Regel-Profil bleibt es bei pandas.
+    """
+    if config.csv_engine != "csv":
+        return False
+    needs_pandas = [name for name, active in (("Katalog-Filter", config.catalog_filter),
+                                              ("Aufteilen", config.shard_rows or config.shard_max_mb),
+                                              ("Datei je Kategorie", config.split_by_category),
+                                              ("Regel-Profil", config.category_profile)) if active]
+    if needs_pandas:
+        print(f"Hinweis: {', '.join(needs_pandas)} gibt es nur auf dem pandas-Weg – csv_engine = \"csv\" "
+              f"wird für diesen Lauf ignoriert.\n")
+        return False
+    return True
+
+
+def convert_records(target_path, stats):
+    """Umwandlung auf dem csv-Weg: CSV zeilenweise lesen, umwandeln und direkt schreiben."""
+    state_fingerprint = records.record_state_fingerprint()
+    state_path = delta_state_file(target_path)
+    records.delta_state = records.load_record_state(state_path, state_fingerprint) if state_path else None
+    records.delta_updates = {}
+    if config.delta_mode and records.delta_state is not None and not records.delta_state:
+        print("Delta-Modus: noch kein Stand vom letzten Lauf vorhanden – alle Produkte werden übertragen.\n")
+
+    print("Lese CSV-Datei ein (csv-Weg ohne pandas) ...")
+    csv_columns = records.read_csv_header(config.csv_path)
+    print("Spalten in der CSV:", ", ".join(csv_columns), "\n")
+    positions = select_csv_columns(csv_columns, stats)
+    if positions is not None:
+        csv_columns = [csv_columns[i] for i in positions]
+    records.print_record_notes(csv_columns)
+    columns = records.record_columns(csv_columns)
+    blocks = records.iter_record_blocks(config.csv_path, columns, stats, positions)
+    write_output(config.excel_path, target_path, records.iter_record_rows(blocks, columns, stats))
+    dropdowns.dropdown_results[target_path] = dropdowns.dropdown_findings
+    print_transform_summary(stats)
+
+    if records.delta_state is not None:
+        # Erst nach erfolgreichem Schreiben: sonst würden Änderungen beim nächsten Lauf fehlen
+        try:
+            records.save_record_state(state_path, state_fingerprint, records.delta_state, records.delta_updates)
+        except OSError as e:
+            print(f"Hinweis: Stand für den Delta-Modus konnte nicht gespeichert werden ({e}).")
+    return [target_path]
+
+
+def convert_frames(target_path, stats):
+    """Umwandlung auf dem pandas-Weg (CSV oder Katalog); gibt die geschriebenen Dateien zurück."""
+    import pandas as pd
+    from . import transform
+    from .catalog import read_catalog_chunks, transform_catalog_chunk
+    from .cells import iter_excel_rows, iter_transformed_chunks
+    from .shards import plan_output_files, write_output_files
+    from .transform import (delta_state_fingerprint, load_delta_state, read_csv_chunks, reset_rule_profile,
+                            save_delta_state, transform_chunk)
+    reset_rule_profile()
+    delta_fingerprint = delta_state_fingerprint()
+    state_path = delta_state_file(target_path)
+    transform.delta_state = load_delta_state(state_path, delta_fingerprint) if state_path else None
+    transform.delta_updates = []
+    if config.delta_mode and transform.delta_state is not None and not len(transform.delta_state):
+        print("Delta-Modus: noch kein Stand vom letzten Lauf vorhanden – alle Produkte werden übertragen.\n")
+
+    if config.catalog_filter:
+        print(f"Lese Produkte aus dem Katalog '{config.catalog_path}' (Filter: {config.catalog_filter}) ...")
+        chunks = measure_chunks("katalog_lesen", read_catalog_chunks(config.catalog_path, config.catalog_filter, config.chunk_size))
+        transform_step = transform_catalog_chunk
+    else:
+        print("Lese CSV-Datei ein ...")
+        csv_columns = records.read_csv_header(config.csv_path)
+        print("Spalten in der CSV:", ", ".join(csv_columns), "\n")
+        usecols = select_csv_columns(csv_columns, stats)
+        chunks = measure_chunks("csv_lesen", read_csv_chunks(config.csv_path, config.chunk_size, usecols))
+        transform_step = transform_chunk
+    if config.chunk_size:
+        print(f"Streaming-Modus: Verarbeitung in Blöcken zu je {config.chunk_size} Zeilen.\n")
+    first_chunk = next(chunks)
+    if config.catalog_filter:
+        # Spaltenübersicht ausgeben (bei der CSV schon vor dem Einlesen)
+        print("Spalten in der CSV:", ", ".join(first_chunk.columns), "\n")
+    first_chunk = transform_step(first_chunk, stats, notes=True)
+    if not config.chunk_size:
+        print_transform_summary(stats)
+
+    if config.split_by_category or config.shard_rows or config.shard_max_mb:
+        # Mehrere Dateien: erst alle Blöcke umwandeln, damit Warennummern/Kategorien zusammenbleiben
+        df = pd.concat(list(iter_transformed_chunks(first_chunk, chunks, stats, transform_step)), ignore_index=True)
+        del first_chunk
+        files = plan_output_files(df, config.excel_path, target_path)
+        output_paths = [path for path, _ in files]
+        print(f"Verteile {len(df)} Produkte auf {len(files)} Dateien ...")
+        with measure_stage("dateien_schreiben"):   # Die Schritte in den Worker-Prozessen sind hier enthalten
+            dropdowns.dropdown_results.update(write_output_files(files, config.excel_path))
+        count_up(stats, "geschrieben", len(df))
+        del df, files
+    else:
+        # Jeder Block wird sofort nach der Umwandlung geschrieben und danach freigegeben
+        rows = iter_excel_rows(iter_transformed_chunks(first_chunk, chunks, stats, transform_step), stats)
+        del first_chunk
+        output_paths = [target_path]
+        write_output(config.excel_path, target_path, rows)
+        dropdowns.dropdown_results[target_path] = dropdowns.dropdown_findings
+    if config.chunk_size:
+        print_transform_summary(stats)
+
+    if transform.delta_state is not None:
+        # Erst nach erfolgreichem Schreiben: sonst würden Änderungen beim nächsten Lauf fehlen
+        try:
+            save_delta_state(state_path, delta_fingerprint, transform.delta_state, transform.delta_updates)
+        except OSError as e:
+            print(f"Hinweis: Stand für den Delta-Modus konnte nicht gespeichert werden ({e}).")
+    return output_paths
+
+
+def run_conversion():
+    """Führt eine komplette Umwandlung mit den aktuellen Einstellungen aus und gibt eine Zusammenfassung zurück."""
+    started = time.time()
+    cpu_started = time.process_time()
+    target_path = config.output_path or config.excel_path
+    stats = {}
+    stage_report.clear()
+    if not shared_category_state:
+        load_category_state()
+    load_dropdown_state(target_path)
+    csv_engine = use_csv_engine()
+    if csv_engine:
+        output_paths = convert_records(target_path, stats)
+    else:
+        output_paths = convert_frames(target_path, stats)
+    store_category_cache()
+    invalid_cells = (print_dropdown_report(dropdowns.dropdown_results, stats)
+                     if dropdowns.dropdown_index is not None else [])
+
+    summary = {"status": "ok", "dateien": output_paths, "csv_weg": "csv" if csv_engine else "pandas",
+               "zaehler": stats, "dauer_s": round(time.time() - started, 3)}
+    if config.run_report:
+        report_path = run_report_path(target_path)
+        try:
+            write_run_report(report_path, summary, cpu_started, invalid_cells)
+            summary["bericht"] = report_path
+        except OSError as e:
+            print(f"Hinweis: Laufbericht konnte nicht gespeichert werden ({e}).")
+
+    print("==============================================================")
+    print("FERTIG - Die Excel-Datei wurde erfolgreich aktualisiert.")
+    for path in output_paths:
+        print(f"         Datei: {path}")
+    if summary.get("bericht"):
+        print(f"         Laufbericht: {summary['bericht']}")
+    print("==============================================================\n")
+    return summary
+
+
+# 10a. Auftragsliste: mehrere Exporte gleichzeitig in Worker-Prozessen. Der Hauptprozess zerlegt jede Vorlage
+#      (je Blatt) samt Dropdown-Listen und lädt den Kategorie-Cache einmal; die Worker bekommen diesen Stand beim
+#      Start übergeben (initargs, auch ohne fork wie unter Windows). Pandas/openpyxl und die kompilierten Regeln
+#      lädt jeder Worker einmal beim Start und benutzt sie für alle seine Aufträge.
+shared_category_state = False        # True in Auftrags-Workern: Kategorie-Cache kommt aus dem Hauptprozess
+run_setting_names = ["sheet_name", "start_row", "excel_engine", "compression_level", "compression_threads",
+                     "chunk_size", "shard_rows", "shard_max_mb", "shard_workers", "split_by_category",
+                     "category_cache_path", "template_snapshot_dir", "delta_mode", "delta_state_path",
+                     "catalog_path", "catalog_filter", "run_report", "category_profile", "csv_engine",
+                     "dropdown_check"]
+
+
+def load_jobs(path):
+    """
+    Liest die Auftragsliste; relative Pfade gelten relativ zum Ordner der Auftragsdatei. Ohne "output"
+    schreibt ein Auftrag nach <Vorlage>_<Name>.xlsx. Zwei Aufträge mit derselben Zieldatei oder eine
+    Zieldatei, die Vorlage eines anderen Auftrags ist, werden abgelehnt (sie würden sich überschreiben).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        jobs = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    for number, job in enumerate(jobs, start=1):
+        if "input" not in job:
+            raise ValueError(f"Auftrag {number} in '{path}' hat keine 'input'-Datei.")
+        for key in ("input", "template", "output"):
+            if job.get(key):
+                job[key] = os.path.join(base_dir, job[key])
+        job.setdefault("template", os.path.abspath(config.excel_path))
+        job.setdefault("name", os.path.splitext(os.path.basename(job["input"]))[0])
+        if not job.get("output"):
+            root, ext = os.path.splitext(job["template"])
+            job["output"] = f"{root}_{job['name']}{ext}"
+
+    def same_file(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    outputs = {}
+    for job in jobs:
+        other = outputs.setdefault(same_file(job["output"]), job)
+        if other is not job:
+            raise ValueError(f"Aufträge '{other['name']}' und '{job['name']}' schreiben beide nach "
+                             f"'{job['output']}' – bitte verschiedene 'output'-Dateien angeben.")
+    for job in jobs:
+        other = outputs.get(same_file(job["template"]))
+        if other is not None and other is not job:
+            raise ValueError(f"Auftrag '{other['name']}' schreibt nach '{other['output']}', die Vorlage von "
+                             f"Auftrag '{job['name']}' ist – bitte eine andere 'output'-Datei angeben.")
+    return jobs
+
+
+def job_warm_state(jobs):
+    """
+    Zerlegt jede (Vorlage, Blatt)-Kombination der Aufträge einmal (XML-Schreibweg und Dropdown-Listen) und
+    lädt den Kategorie-Cache. Rückgabe: Stand für init_job_worker.
+    """
+    for template_path, sheet in sorted({(job["template"], job.get("sheet", config.sheet_name)) for job in jobs}):
+        if not os.path.exists(template_path):
+            continue  # Fehler meldet der jeweilige Auftrag selbst
+        try:
+            if config.excel_engine == "xml":
+                with zipfile.ZipFile(template_path) as zin:
+                    load_template_sheet(zin, template_path, sheet)
+            if config.dropdown_check:
+                load_dropdown_index(template_path, sheet=sheet)
+        except (ValueError, zipfile.BadZipFile) as e:
+            print(f"Hinweis: Vorlage '{template_path}' (Blatt '{sheet}'): {e} – betroffene Aufträge melden den Fehler.\n")
+    load_category_state()
+    return {"vorlagen": dict(xml_engine.template_sheets), "dropdowns": dict(dropdowns.dropdown_indexes),
+            "kategorien": (rules.category_fingerprint, rules.category_cache)}
+
+
+def init_job_worker(settings, warm_state):
+    """Startet einen Auftrags-Worker mit den Einstellungen und dem vorbereiteten Stand des Hauptprozesses."""
+    global shared_category_state
+    init_output_worker(settings)
+    xml_engine.template_sheets.update(warm_state["vorlagen"])
+    dropdowns.dropdown_indexes.update(warm_state["dropdowns"])
+    rules.category_fingerprint, rules.category_cache = warm_state["kategorien"]
+    shared_category_state = True
+
+
+def run_job(job):
+    """Führt einen Auftrag aus (läuft in einem Worker-Prozess) und gibt seine Zusammenfassung zurück."""
+    config.configure(csv_path=job["input"], excel_path=job["template"], output_path=job["output"],
+                     sheet_name=job.get("sheet", config.sheet_name))
+    started = time.time()
+    try:
+        summary = run_conversion()
+    except Exception as e:
+        summary = {"status": "fehler", "fehler": str(e)}
+    summary.update({"auftrag": job["name"], "dauer_s": round(time.time() - started, 3)})
+    return summary
+
+
+def run_jobs(path):
+    """Arbeitet die Auftragsliste mit job_workers Prozessen ab und gibt einen Bericht je Auftrag aus."""
+    started = time.time()
+    jobs = load_jobs(path)
+    workers = max(1, min(len(jobs), config.job_workers or os.cpu_count() or 1))
+    print(f"{len(jobs)} Aufträge aus '{path}', {workers} gleichzeitig ...\n")
+
+    warm_state = job_warm_state(jobs)
+    settings = {name: getattr(config, name) for name in run_setting_names}
+    settings["compression_threads"] = max(1, (config.compression_threads or os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_job_worker,
+                             initargs=(settings, warm_state)) as pool:
+        summaries = list(pool.map(run_job, jobs))
+
+    print(f"{'Auftrag':<30} {'Status':<7} {'gelesen':>9} {'geschrieben':>11} {'Sekunden':>9} {'Zeilen/s':>9}")
+    for summary in summaries:
+        counts = summary.get("zaehler", {})
+        rows_read = counts.get("gelesen", 0)
+        rate = rows_read / summary["dauer_s"] if summary["dauer_s"] else 0
+        summary["zeilen_pro_s"] = round(rate, 1)
+        print(f"{summary['auftrag'][:30]:<30} {summary['status']:<7} {rows_read:>9} "
+              f"{counts.get('geschrieben', 0):>11} {summary['dauer_s']:>9.2f} {rate:>9.0f}")
+        if summary["status"] != "ok":
+            print(f"    FEHLER: {summary['fehler']}")
+    failed = sum(summary["status"] != "ok" for summary in summaries)
+    print(f"\n{len(jobs) - failed} von {len(jobs)} Aufträgen erfolgreich "
+          f"({time.time() - started:.1f} s insgesamt).\n")
+    return {"status": "fehler" if failed else "ok", "auftraege": summaries,
+            "dauer_s": round(time.time() - started, 3)}
@@ -0,0 +1,392 @@
+"""
+csv-Weg (csv_engine = "csv"): liest die CSV ohne pandas mit dem csv-Modul und führt dieselben Schritte
+2a bis 5.3 wie transform aus. Jede Zeile ist eine schlichte Liste; die Schritte greifen über eine einmal
+aus der Kopfzeile berechnete Zuordnung Spaltenname -> Position darauf zu. Die Zeilen laufen blockweise
+durch die Schritte und gehen danach direkt an den Schreibweg, ohne DataFrame dazwischen.
+Nur Standardbibliothek; die Excel-Datei ist dieselbe wie auf dem pandas-Weg.
+"""
+import csv
+import json
+import math
+import time
+import hashlib
+from . import config, dropdowns, rules
+from .columns import column_mapping
+from .dropdowns import check_dropdown_rows, dropdown_checks
+from .fields import (category_text_cols, compile_write_plan, country_map, delta_key_cols, filter_terms, is_missing,
+                     mm_to_cm_cols, placeholder_values, required_cols, sum_stueckzahlen)
+from .report import count_up, measure_chunks, measure_stage, run_stage
+from .statefiles import write_json_file
+
+# Werte, die pandas' read_csv von sich aus als fehlend liest (Standard von na_values, exakter Vergleich)
+csv_na_values = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN", "<NA>",
+    "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+])
+record_block_rows = 2000             # Zeilen je Block, wenn chunk_size nicht gesetzt ist
+memo_max_entries = 50000             # Zwischengespeicherte Zellwerte je Spalte (danach wird geleert)
+
+
+# 2. CSV einlesen (Semikolon-separiert), Spaltennamen und fehlende Werte wie pandas
+def unique_column_names(header):
+    """Spaltennamen wie bei pandas: leere Namen -> 'Unnamed: <Nr>', doppelte Namen -> 'Name.1', 'Name.2', ..."""
+    names = [name if name else f"Unnamed: {i}" for i, name in enumerate(header)]
+    counts = {}
+    for i, name in enumerate(names):
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts.get(name, 0)
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
+
+def csv_rows(f):
+    """Liest die Zeilen der geöffneten CSV; Leerzeilen werden wie bei pandas übersprungen."""
+    for row in csv.reader(f, delimiter=";"):
+        if row:
+            yield row
+
+
+def read_csv_header(path):
+    """Spaltennamen der CSV (erste nicht leere Zeile)."""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        header = next(csv_rows(f), None)
+    if header is None:
+        raise ValueError(f"Die CSV '{path}' ist leer.")
+    return unique_column_names(header)
+
+
+def read_csv_records(path, width, block_rows, positions=None):
+    """
+    Liefert die Datenzeilen der CSV als Blöcke von Listen mit je width Einträgen: fehlende Werte
+    (csv_na_values) werden None, kürzere Zeilen mit None aufgefüllt. positions = nur diese Spalten
+    übernehmen (None = alle). Auch eine CSV ohne Daten liefert einen (leeren) Block, damit die
+    Hinweise und Zähler wie auf dem pandas-Weg entstehen.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        rows = csv_rows(f)
+        csv_width = len(next(rows, ()))
+        block = []
+        yielded = False
+        for line, row in enumerate(rows, start=2):
+            if len(row) > csv_width:
+                raise ValueError(f"Zeile {line} der CSV hat {len(row)} statt {csv_width} Felder.")
+            if positions is not None:
+                row = [row[i] if i < len(row) else "" for i in positions]
+            record = [None if value in csv_na_values else value for value in row]
+            record.extend([None] * (width - len(record)))
+            block.append(record)
+            if len(block) >= block_rows:
+                yield block
+                yielded = True
+                block = []
+        if block or not yielded:
+            yield block
+
+
+def record_columns(csv_columns):
+    """Spalten der Zeilen-Listen: die CSV-Spalten plus die in 2a und 4 angelegten 'Anzahl' und 'Artikel'."""
+    columns = list(csv_columns)
+    if "Anzahl" not in columns:
+        columns.append("Anzahl")
+    if "Gesamtartikelanzahl" in columns and "Artikel" not in columns:
+        columns.append("Artikel")
+    return columns
+
+
+def print_record_notes(csv_columns):
+    """Gibt die Hinweise zu den Spalten aus, die der pandas-Weg beim ersten Block ausgibt."""
+    if "Anzahl" in csv_columns:
+        print("Leere Werte in 'Anzahl' wurden auf 1 gesetzt.\n")
+    else:
+        print("Spalte 'Anzahl' fehlte. Sie wurde mit dem Standardwert 1 hinzugefügt.\n")
+    if "Nicht verfügbar für Listenpreis" in csv_columns:
+        print("Leere Werte in 'Nicht verfügbar für Listenpreis' wurden zu 'N/A' geändert.\n")
+    else:
+        print("Hinweis: Spalte 'Nicht verfügbar für Listenpreis' nicht in der CSV gefunden.\n")
+    if "Ursprungsland/-region" in csv_columns:
+        print("Spalte 'Ursprungsland/-region' nach Vorgaben übersetzt.\n")
+    else:
+        print("Hinweis: Spalte 'Ursprungsland/-region' nicht in der CSV gefunden.\n")
+    print("Konvertiere Maße von mm in cm (mindestens 1 cm)...")
+    for col in mm_to_cm_cols:
+        if col in csv_columns:
+            print(f"  -> Spalte '{col}': Umrechnung mm → cm durchgeführt (Min. 1).")
+        else:
+            print(f"  -> Hinweis: Spalte '{col}' ist in der CSV nicht vorhanden.")
+    print()
+    print("Berechne Gesamtartikelanzahl aus einzelnen Stückzahlen...")
+    if "Gesamtartikelanzahl" in csv_columns:
+        print("Spalte 'Artikel' wurde aus 'Gesamtartikelanzahl' berechnet.\n")
+    else:
+        print("Hinweis: Spalte 'Gesamtartikelanzahl' nicht in der CSV gefunden.\n")
+    if "Kategorie" not in csv_columns:
+        print("Hinweis: Spalte 'Kategorie' nicht in der CSV gefunden – Automatisierung übersprungen.\n")
+    if "Kategorie" not in csv_columns and "Kategoriename" not in csv_columns:
+        print("Hinweis: Keine Kategorie-Spalte vorhanden – Kategorie-Filter übersprungen.\n")
+    if not any(col in csv_columns for col in required_cols):
+        print("Hinweis: Spalten für Produktidentifikation/Preis/Bild fehlen – Überprüfung übersprungen.\n")
+    if delta_state is not None and not any(col in csv_columns for col in delta_key_cols):
+        print("Hinweis: Spalten 'SKU-ID'/'Verkäufer SKU' fehlen – Delta-Abgleich übersprungen.\n")
+
+
+# 2a. bis 5.3: dieselben Schritte wie in transform, je Block auf den Zeilen-Listen (pos = Spalte -> Position)
+def apply_defaults_rows(rows, pos):
+    """Setzt leere 'Anzahl' auf 1 und leere 'Nicht verfügbar für Listenpreis' auf N/A."""
+    count = pos["Anzahl"]
+    unavailable = pos.get("Nicht verfügbar für Listenpreis")
+    for row in rows:
+        if not row[count]:
+            row[count] = "1"
+        if unavailable is not None and row[unavailable] is None:
+            row[unavailable] = "N/A"
+    return rows
+
+
+def translate_countries_rows(rows, pos):
+    """Übersetzt 'Ursprungsland/-region' nach country_map."""
+    col = pos.get("Ursprungsland/-region")
+    if col is not None:
+        for row in rows:
+            if row[col] is not None:
+                value = row[col].strip()
+                row[col] = country_map.get(value, value)
+    return rows
+
+
+def parse_number(value):
+    """Zahl aus einem CSV-Wert wie pd.to_numeric(errors="coerce"): nur ASCII-Zahlen, sonst None."""
+    if value is None or not value.isascii() or "_" in value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def dimension_cm(value):
+    """mm-Wert -> ganze cm (ungültig oder leer -> 1, mindestens 1); gerundet wie pandas (halbe zur geraden Zahl)."""
+    number = parse_number(value)
+    if number is None or math.isnan(number):
+        return 1
+    return round(max(number / 10.0, 1))
+
+
+def convert_dimensions_rows(rows, pos):
+    """Rechnet die Maß-Spalten von mm in ganze cm um (ungültig/zu klein -> 1)."""
+    for col in [pos[name] for name in mm_to_cm_cols if name in pos]:
+        for row in rows:
+            row[col] = dimension_cm(row[col])
+    return rows
+
+
+def compute_artikel_rows(rows, pos):
+    """Berechnet 'Artikel' aus den Stückzahlen in 'Gesamtartikelanzahl'."""
+    source = pos.get("Gesamtartikelanzahl")
+    if source is not None:
+        target = pos["Artikel"]
+        for row in rows:
+            row[target] = sum_stueckzahlen(row[source])
+    return rows
+
+
+def classify_text(text, now, stats):
+    """Kategorie-ID zum Text, über den Kategorie-Cache, falls eingeschaltet (now = Zeitpunkt der Nutzung)."""
+    if not config.category_cache_path:
+        return rules.pick_category_from_text(text)
+    key = rules.category_cache_key(text, rules.category_fingerprint)
+    entry = rules.category_cache.get(key)
+    if entry is None:
+        entry = rules.category_cache[key] = [rules.pick_category_from_text(text), 0]
+        count_up(stats, "cache_neu", 1)
+    entry[1] = now
+    # Der pandas-Weg speichert "keine Kategorie" als NaN, hier gilt None
+    return None if is_missing(entry[0]) else entry[0]
+
+
+def categorize_rows(rows, pos, stats):
+    """Setzt 'Kategorie' anhand von Beschreibung, Name und Kategoriename (gleiche Texte nur einmal je Block)."""
+    target = pos.get("Kategorie")
+    if target is None:
+        return rows
+    sources = [pos[col] for col in category_text_cols if col in pos]
+    found = {}
+    assigned = 0
+    now = time.time()
+    if config.category_cache_path:
+        count_up(stats, "cache_neu", 0)
+    for row in rows:
+        text = "".join(" " + row[col] for col in sources if row[col] is not None)
+        cat_id = found.get(text, found)
+        if cat_id is found:
+            cat_id = found[text] = classify_text(text, now, stats)
+        if cat_id is not None:
+            row[target] = cat_id
+            assigned += 1
+    if config.category_cache_path:
+        count_up(stats, "cache_texte", len(found))
+    count_up(stats, "kategorie_gesetzt", assigned)
+    return rows
+
+
+def filter_categories_rows(rows, pos, stats):
+    """Entfernt Produkte, deren Kategorie(-name) einen der filter_terms enthält."""
+    cols = [pos[name] for name in ("Kategorie", "Kategoriename") if name in pos]
+    if not cols:
+        return rows
+    kept = [row for row in rows
+            if not any(row[col] is not None and any(term in str(row[col]).lower() for term in filter_terms)
+                       for col in cols)]
+    count_up(stats, "kategorie_filter_vorher", len(rows))
+    count_up(stats, "kategorie_filter_ignoriert", len(rows) - len(kept))
+    return kept
+
+
+def filter_incomplete_rows(rows, pos, stats):
+    """Entfernt Produkte ohne Produktidentifikation, Preis oder SKU-Bild."""
+    cols = [pos[name] for name in required_cols if name in pos]
+    if not cols:
+        return rows
+    empty = set(placeholder_values) | {""}
+    kept = [row for row in rows
+            if not any(row[col] is None or str(row[col]).strip().lower() in empty for col in cols)]
+    count_up(stats, "unvollstaendig_vorher", len(rows))
+    count_up(stats, "unvollstaendig_ignoriert", len(rows) - len(kept))
+    return kept
+
+
+# 5.3 Delta-Modus: eigener Stand für den csv-Weg (anderer Fingerabdruck als beim pandas-Weg)
+delta_state = None                   # SKU -> Fingerabdruck des letzten Laufs (wird in run_conversion geladen)
+delta_updates = {}                   # Fingerabdrücke dieses Laufs
+
+
+def record_state_fingerprint():
+    """Ändert sich das Spalten-Mapping, gilt der alte Stand nicht mehr; der pandas-Weg hat einen eigenen."""
+    return hashlib.sha256(repr((column_mapping, "csv")).encode("utf-8")).hexdigest()
+
+
+def load_record_state(path, fingerprint):
+    """Lädt den Stand des letzten Laufs als dict SKU -> Fingerabdruck."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = None
+    if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+        return {}
+    return data.get("produkte", {})
+
+
+def save_record_state(path, fingerprint, state, updates):
+    """Schreibt den Stand zurück: bisherige Einträge plus die Fingerabdrücke dieses Laufs."""
+    merged = dict(state)
+    merged.update(updates)
+    write_json_file(path, {"fingerprint": fingerprint, "produkte": merged})
+
+
+def row_fingerprint(values):
+    """64-Bit-Fingerabdruck der gemappten Felder einer Zeile."""
+    text = "\x1f".join("\x00" if value is None else str(value) for value in values)
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def filter_unchanged_rows(rows, pos, stats):
+    """
+    Merkt je Zeile mit SKU den Fingerabdruck aller gemappten Felder für den nächsten Lauf vor;
+    im Delta-Modus werden Zeilen mit unverändertem Fingerabdruck entfernt.
+    """
+    key_cols = [pos[name] for name in delta_key_cols if name in pos]
+    if delta_state is None or not key_cols:
+        return rows
+    cols = [pos[name] for name in column_mapping if name in pos]
+    kept = []
+    for row in rows:
+        key = next((row[col] for col in key_cols if row[col] is not None and row[col].strip() != ""), None)
+        if key is None:
+            kept.append(row)
+            continue
+        fingerprint = row_fingerprint([row[col] for col in cols])
+        delta_updates[key] = fingerprint
+        if not config.delta_mode or delta_state.get(key) != fingerprint:
+            kept.append(row)
+    if config.delta_mode:
+        count_up(stats, "delta_vorher", len(rows))
+        count_up(stats, "delta_unveraendert", len(rows) - len(kept))
+    return kept
+
+
+def transform_records(rows, pos, stats):
+    """Führt alle Umwandlungen und Filter (Schritte 2a bis 5.3) für einen Block aus."""
+    count_up(stats, "gelesen", len(rows))
+    rows = run_stage("standardwerte", apply_defaults_rows, rows, pos)
+    rows = run_stage("laender", translate_countries_rows, rows, pos)
+    rows = run_stage("masse_mm_cm", convert_dimensions_rows, rows, pos)
+    rows = run_stage("gesamtartikelanzahl", compute_artikel_rows, rows, pos)
+    rows = run_stage("kategorien", categorize_rows, rows, pos, stats)
+    rows = run_stage("filter_kategorien", filter_categories_rows, rows, pos, stats)
+    rows = run_stage("filter_unvollstaendig", filter_incomplete_rows, rows, pos, stats)
+    rows = run_stage("delta", filter_unchanged_rows, rows, pos, stats)
+    return rows
+
+
+def iter_record_blocks(path, columns, stats, positions=None):
+    """
+    Liest die CSV blockweise (chunk_size bzw. record_block_rows Zeilen) und liefert die umgewandelten Blöcke.
+    positions = Positionen der einzulesenden CSV-Spalten (None = alle).
+    """
+    pos = {name: i for i, name in enumerate(columns)}
+    blocks = read_csv_records(path, len(columns), config.chunk_size or record_block_rows, positions)
+    for rows in measure_chunks("csv_lesen", blocks):
+        yield transform_records(rows, pos, stats)
+
+
+# 9. Zellwerte je Zeile nach dem Schreibplan, Ergebnisse je Spalte und Rohwert zwischengespeichert
+def iter_record_rows(blocks, columns, stats):
+    """
+    Liefert (Excel-Zeile, Zellen) wie iter_excel_rows, aber aus den Zeilen-Listen: je Zeile werden die
+    Umwandlungen des Schreibplans angewendet (gleiche Rohwerte nur einmal), Spaltenbereiche auf ihre
+    Einzelspalten verteilt und bei doppelt belegten Spalten gewinnt die spätere Zuordnung.
+    """
+    pos = {name: i for i, name in enumerate(columns)}
+    plan = compile_write_plan(columns)
+    targets = {}                     # Spaltennummer -> (Eintrag im Plan, Position im Spaltenbereich oder None)
+    for number, (_, _, col_indices, is_range) in enumerate(plan):
+        for j, col_idx in enumerate(col_indices):
+            targets[col_idx] = (number, j if is_range else None)
+    col_order = sorted(targets)
+    picks = [targets[col_idx] for col_idx in col_order]
+    steps = [(pos[csv_col], func, len(col_indices) if is_range else None, {})
+             for csv_col, func, col_indices, is_range in plan]
+    excel_row = config.start_row
+    checks = dropdown_checks(dropdowns.dropdown_index, col_order) if dropdowns.dropdown_index is not None else None
+    for rows in blocks:
+        with measure_stage("zellwerte") as entry:
+            prepared = []
+            for row in rows:
+                results = []
+                for col, func, width, memo in steps:
+                    value = row[col]
+                    result = memo.get(value, memo)
+                    if result is memo:
+                        if len(memo) >= memo_max_entries:
+                            memo.clear()
+                        result = func(value)
+                        if width is not None:
+                            result = result[:width] + [""] * (width - len(result[:width]))
+                        memo[value] = result
+                    results.append(result)
+                prepared.append([results[number] if j is None else results[number][j] for number, j in picks])
+        count_up(entry, "zeilen_ein", len(rows))
+        if checks:
+            with measure_stage("dropdown_pruefung") as entry:
+                check_dropdown_rows(dropdowns.dropdown_index, checks, excel_row, prepared)
+            count_up(entry, "zeilen_ein", len(rows))
+        for row_values in prepared:
+            yield excel_row, zip(col_order, row_values)
+            excel_row += 1
+        count_up(stats, "geschrieben", len(rows))
+        if config.chunk_size:
+            print(f"  -> {stats['gelesen']} Zeilen gelesen, {stats['geschrieben']} geschrieben.")
@@ -0,0 +1,127 @@
+"""
+Messung der Verarbeitungsschritte für den Laufbericht: Wandzeit, CPU-Zeit, Speicher-Höchststand
+und Zeilen je Schritt, dazu die Zähler-Ausgabe nach der Umwandlung. Nur Standardbibliothek, damit
+der Start schnell bleibt.
+"""
+import os
+import sys
+import time
+import ctypes
+import contextlib
+try:
+    import resource   # Linux/macOS (Speicher-Höchststand für den Laufbericht)
+except ImportError:
+    resource = None
+from . import config
+
+
+# 1a. Messung der Schritte für den Laufbericht (kostet je Schritt und Block nur wenige Mikrosekunden)
+stage_report = {}                    # Schritt -> Messwerte des aktuellen Laufs
+stage_stack = []                     # Gerade laufende Schritte (verschachtelt, siehe measure_stage)
+
+
+def count_up(stats, key, amount):
+    """Addiert einen Zähler in stats auf (Summen über alle Blöcke)."""
+    stats[key] = stats.get(key, 0) + amount
+
+
+class ProcessMemoryCounters(ctypes.Structure):
+    """PROCESS_MEMORY_COUNTERS der Windows-API (psapi)."""
+    _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong),
+                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+
+def peak_memory_mb():
+    """Bisher höchster Arbeitsspeicher des Prozesses in MB (None, falls das System ihn nicht liefert)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss   # macOS: Bytes, sonst KB
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    if sys.platform == "win32":
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess
+        process.restype = ctypes.c_void_p
+        get_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_info.argtypes = [ctypes.c_void_p, ctypes.POINTER(ProcessMemoryCounters), ctypes.c_ulong]
+        if get_info(process(), ctypes.byref(counters), counters.cb):
+            return round(counters.PeakWorkingSetSize / (1024 * 1024), 1)
+    return None
+
+
+@contextlib.contextmanager
+def measure_stage(name):
+    """
+    Misst Wandzeit und CPU-Zeit eines Schritts und summiert sie in stage_report[name] auf (im
+    Streaming-Modus über alle Blöcke). Läuft darin ein weiterer gemessener Schritt (z.B. wird die
+    CSV erst beim Schreiben blockweise gelesen), zählt dessen Zeit nur bei ihm und nicht doppelt.
+    """
+    entry = stage_report.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0})
+    frame = [time.perf_counter(), time.process_time(), 0.0, 0.0]   # Start, Start CPU, innere Schritte
+    stage_stack.append(frame)
+    try:
+        yield entry
+    finally:
+        stage_stack.pop()
+        wall = time.perf_counter() - frame[0]
+        cpu = time.process_time() - frame[1]
+        entry["wall_s"] += wall - frame[2]
+        entry["cpu_s"] += cpu - frame[3]
+        entry["peak_mb"] = peak_memory_mb()
+        if stage_stack:
+            stage_stack[-1][2] += wall
+            stage_stack[-1][3] += cpu
+
+
+def run_stage(name, func, df, *args):
+    """Führt einen Umwandlungsschritt func(df, *args) gemessen aus und zählt die Zeilen davor/danach."""
+    with measure_stage(name) as entry:
+        result = func(df, *args)
+    count_up(entry, "zeilen_ein", len(df))
+    count_up(entry, "zeilen_aus", len(result))
+    return result
+
+
+def measure_chunks(name, chunks):
+    """Reicht die Blöcke aus chunks durch und misst dabei das Einlesen (es passiert erst bei next())."""
+    while True:
+        with measure_stage(name) as entry:
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        count_up(entry, "zeilen_aus", len(chunk))
+        yield chunk
+
+
+def run_report_path(target_path):
+    """Pfad des Laufberichts zur Zieldatei, z.B. TEMU.xlsx -> TEMU_bericht.json."""
+    return os.path.splitext(target_path)[0] + "_bericht.json"
+
+
+def print_transform_summary(stats):
+    """Gibt die Zähler der Verarbeitungsschritte aus (im Streaming-Modus über alle Blöcke)."""
+    if "cache_texte" in stats:
+        print(f"Kategorie-Cache: {stats['cache_texte'] - stats['cache_neu']} von {stats['cache_texte']} "
+              f"Texten bekannt, {stats['cache_neu']} neu klassifiziert.")
+    if "kategorie_gesetzt" in stats:
+        print(f"Kategorie-Automatisierung: Für {stats['kategorie_gesetzt']} Produkte wurde die Kategorie-ID gesetzt.\n")
+        if config.category_profile:
+            from .transform import print_rule_profile   # Das Regel-Profil gibt es nur auf dem pandas-Weg
+            print_rule_profile()
+    if "kategorie_filter_vorher" in stats:
+        remaining = stats["kategorie_filter_vorher"] - stats["kategorie_filter_ignoriert"]
+        print(f"Kategorie-Filter: {stats['kategorie_filter_ignoriert']} von {stats['kategorie_filter_vorher']} "
+              f"Produkten ignoriert (enthielten 'Garten' oder 'Haushalt').")
+        print(f"Verbleibende Produkte zur Übertragung: {remaining}\n")
+    if "unvollstaendig_vorher" in stats:
+        remaining = stats["unvollstaendig_vorher"] - stats["unvollstaendig_ignoriert"]
+        print(f"Ungültige Produkte (fehlende ID/Preis/Bild) ignoriert: {stats['unvollstaendig_ignoriert']} "
+              f"von {stats['unvollstaendig_vorher']}.")
+        print(f"Verbleibende Produkte zur Übertragung: {remaining}\n")
+    if "delta_vorher" in stats:
+        remaining = stats["delta_vorher"] - stats["delta_unveraendert"]
+        print(f"Delta-Modus: {stats['delta_unveraendert']} von {stats['delta_vorher']} Produkten "
+              f"unverändert seit dem letzten Lauf – nicht übertragen.")
+        print(f"Verbleibende Produkte zur Übertragung: {remaining}\n")
@@ -0,0 +1,307 @@
+"""
+Kategorie-Regeln (5. Kategorie-Automatisierung per Keywords), ihre Kompilierung mit
+Stichwort-Vorfilter und der Cache der Zuordnungen. Nur Standardbibliothek: Regeln lassen sich
+ohne pandas prüfen und anwenden.
+"""
+import re
+import json
+import time
+import hashlib
+try:
+    from re import _parser as sre_parse   # Python >= 3.11
+except ImportError:
+    import sre_parse
+from . import config
+from .statefiles import locked, write_json_file
+
+
+# 5. Kategorie-Automatisierung per Keywords (falls Kategorie-Spalte vorhanden)
+# Reihenfolge = Priorität (spezifisch -> allgemein)
+
+category_rules = [
+    # Licht / Scheinwerfer & Blinker
+    (21842, "Scheinwerferbaugruppen, Teile & Zubehör / Scheinwerferbaugruppen",     [r"\b(haupt|front)?scheinwerfer(n)?\b", r"\bhead\s*light(s)?\b", r"\bheadlight(s)?\b", r"\bnebelscheinwerfer(n)?\b", r"\b(tagfahrlicht|tfl)\b", r"\b(blinker|seitenblinker|blinklicht)(n)?\b",
+     r"\b(standlicht|rücklicht|ruecklicht)\b", r"\b(leuchtmittel|birne(n)?|bulb(s)?)\b",]),
+
+    # Kühlergrill / Frontgrill (weniger "grill" allein, mehr Kontext)
+    (21792, "Kühlergrills", [ r"\b(kühler|kuehler)\s*grill\b", r"\bkühlergrill\b", r"\bfront\s*grill(e)?\b", r"\bfrontgrill\b", r"\b(radiator|radiator)\s*grill(e)?\b",
+     r"\bgrillgitter\b", r"\bkühlergitter\b", r"\bgrille\b",]),
+
+    # Außenspiegel
+    (21873, "Spiegel & Teile / Außenspiegel", [ r"\b(außen|aussen)spiegel\b", r"\bseitenspiegel\b", r"\bspiegelkappe(n)?\b", r"\bspiegelglas\b", r"\bspiegelblinker\b", r"\b(wing\s*)?mirror(s)?\b",]),
+
+    # Frontspoiler / Frontlippe (sehr spezifisch -> vor "Spoiler")
+    (22226, "Frontspoiler",
+ [
+     r"\bfrontspoiler\b",
+     r"\bfront\s*lip(pe)?\b",
+     r"\bfrontlippe\b",
+     r"\bsplitter\b",
+     r"\bspoilerlippe\b",
+     r"\b(front|vorder)\s*spoiler\b",
+ ]),
+
+    # Spoiler allgemein (Heck/Dach/Wing etc.)
+    (22229, "Spoiler",
+ [
+     r"\bheckspoiler\b",
+     r"\bhec?kspoiler\b",
+     r"\bheckflügel\b",
+     r"\bheckfluegel\b",
+     r"\bdachspoiler\b",
+     r"\brear\s*spoiler\b",
+     r"\bwing\b",
+     r"\bspoiler\b",
+     r"\bdiffusor\b",
+ ]),
+
+    # Fahrwerk / Stoßdämpfer (spezifisch)
+    (21775, "Stoßdämpfer",
+ [
+     r"\b(stoß|stoss)dämpfer(n)?\b",
+     r"\bshock\s*absorber(s)?\b",
+     r"\bfederbein(e)?\b",
+     r"\bgewinde\s*fahrwerk\b",
+     r"\bcoilover(s)?\b",
+ ]),
+
+    # Dämpfer (allgemeiner Begriff, daher nach Stoßdämpfer)
+    (21691, "Dämpfer",
+ [
+     r"\bdämpfer(n)?\b",
+     r"\bdamper(s)?\b",
+ ]),
+
+    # Isolierung / Schall- und Wärmedämmung
+    (21796, "Isolierung / Schall- und Wärmedämmung",
+ [
+     r"\b(isolier(ung|material)|isolation)\b",
+     r"\b(schall|geräusch|geraeusch)\s*dämm(ung|matte|material)\b",
+     r"\b(wärme|waerme)\s*dämm(ung|matte|material)\b",
+     r"\bhitze(schutz|schutzmatte)\b",
+     r"\bthermo(mat(te|te)|isolierung)\b",
+     r"\b(alubutyl|bitumenmatte|dämmvlies)\b",
+     r"\bnoise\s*(deadening|insulation)\b",
+     r"\bheat\s*(shield|insulation)\b",
+     r"\bsound\s*(deadening|proofing)\b",
+     r"\bfire\s*wall\s*insulation\b",
+     r"\bhood\s*insulation\b",
+ ]),
+
+    # Diebstahlschutz / Schlüssel / Zugangssysteme / Fernbedienung / Funk & Fernsteuerung
+    (22066, "Diebstahlschutz / Schlüssel / Zugangssysteme / Fernbedienung / Funk & Fernsteuerung",
+ [
+     # Schlüssel / Key / Fob
+     r"\b(schlüssel|schluessel)\b",
+     r"\bkey(s)?\b",
+     r"\bkey\s*fob(s)?\b",
+     r"\bfernbedienung(en)?\b",
+     r"\bfunk\s*fernbedienung(en)?\b",
+     r"\bremote(\s*control)?\b",
+     r"\bremote\s*key\b",
+     r"\bzentralverriegelung\b",
+     r"\bcentral\s*locking\b",
+     r"\btür\s*(öffner|oeffner)\b",
+     r"\bdoor\s*(opener|unlock)\b",
+ ]),
+
+
+    # Innenraum / Schalter (NICHT "schalter" alleine)
+    (21903, "Innenraum / Innenraumschalter",
+ [
+     r"\binnenraum(s)?\b",
+     r"\binnenraumschalter\b",
+     r"\bfensterheber(\s*schalter)?\b",
+     r"\bwindow\s*switch\b",
+     r"\blichtschalter\b",
+     r"\btaster\b",
+     r"\bbedienelement(e)?\b",
+     r"\bschalterleiste\b",
+ ]),
+
+    # Abgase / Auspuffrohre & Endrohre (Flexrohr bleibt hier = Abgas-Flexrohr)
+    (21680, "Abgase & Emissionen / Auspuffrohre & -Endrohre",
+ [
+     r"\bauspuff\b",
+     r"\bendrohr(e)?\b",
+     r"\babgas\b",
+     r"\bflexrohr\b",
+     r"\bdownpipe\b",
+     r"\brohrschelle(n)?\b",
+     r"\brohrverbinder\b",
+     r"\bauspuff(rohr)?\b",
+ ]),
+
+    # NEU: Schläuche / Flex (gezielt, nicht jedes "Schlauch" matchen)
+    (20555, "20555 - Riemen, Schläuche & Riemenscheiben / Schläuche / Flex",
+ [
+     r"\bflex\s*schlauch\b",
+     r"\bflexschlauch\b",
+     r"\bflex\s*hose\b",
+     r"\bflexible(r|s)?\s*schlauch\b",
+     r"\b(kühlwasser|kuehlwasser)\s*schlauch\b",
+     r"\b(wasser|luft|ansaug|turbo|unterdruck|kraftstoff)\s*schlauch\b",
+     r"\bintercooler\s*schlauch\b",
+ ]),
+
+    # Karosserie & Zierleisten / Karosseriesätze (breit, aber auto-spezifisch)
+    (21785, "Karosserie & Zierleisten / Karosserie / Karosseriesätze",
+ [
+     r"\bkarosserie(satz|kit|teile)?\b",
+     r"\bbody\s*kit\b",
+     r"\bladekantenschutz\b",
+     r"\bzierleiste(n)?\b",
+     r"\bkantenschutz\b",
+     r"\bnummernschildhalter\b",
+     r"\bdomstrebe\b",
+     r"\bstoßstange\b",
+     r"\bstoßfänger\b",
+     r"\bstossfaenger\b",
+     r"\bschürze\b",
+     r"\bschuerze\b",
+     r"\bblende(n)?\b",
+     r"\bverkleidung\b",
+     r"\bvnummernschild\b",
+ ]),
+]
+
+# Sonderfälle, in denen re.IGNORECASE weiter fasst als str.lower() (z.B. "ſ" passt auf "s")
+casefold_fixes = str.maketrans({"ı": "i", "İ": "i", "ſ": "s"})
+
+
+def fold_text(text):
+    """Bringt Text in die Kleinschreibung, mit der der Stichwort-Vorfilter arbeitet."""
+    return text.translate(casefold_fixes).lower()
+
+
+def required_literals(items):
+    """
+    Ermittelt aus einem geparsten Regex-Muster die Wörter, von denen mindestens eines im Text
+    vorkommen muss, damit das Muster überhaupt passen kann (Stichwort-Vorfilter).
+    Gibt ein Set von Wörtern zurück oder None, wenn kein sicheres Pflichtwort existiert.
+    """
+    best = None
+    run = []
+
+    def consider(candidate):
+        nonlocal best
+        if not candidate:
+            return
+        # Das Set mit dem kürzesten Wort ist nur so gut wie dieses Wort -> längstes Minimum gewinnt
+        if best is None or min(map(len, candidate)) > min(map(len, best)):
+            best = candidate
+
+    for op, av in items:
+        if op is sre_parse.LITERAL and (chr(av).isascii() or chr(av) in "äöüß"):
+            run.append(chr(av))
+            continue
+        if op is sre_parse.AT:
+            continue  # \b, ^, $ verbrauchen keine Zeichen
+        consider({fold_text("".join(run))} if run else None)
+        run = []
+        if op is sre_parse.SUBPATTERN:
+            consider(required_literals(av[-1]))
+        elif op is sre_parse.BRANCH:
+            alternatives = [required_literals(alt) for alt in av[1]]
+            if all(alternatives):
+                consider(set().union(*alternatives))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            consider(required_literals(av[2]))
+    consider({fold_text("".join(run))} if run else None)
+    return best
+
+
+def compile_category_rules(rules):
+    """
+    Kompiliert category_rules einmalig: je Regel ein gemeinsamer Regex aller Muster
+    plus die Stichwörter für den Vorfilter (None = Regel muss immer geprüft werden).
+    Die Reihenfolge (= Priorität) bleibt erhalten.
+    """
+    compiled = []
+    for cat_id, _, patterns in rules:
+        regex = re.compile("|".join(f"(?:{pat})" for pat in patterns), flags=re.IGNORECASE)
+        literals = set()
+        for pat in patterns:
+            pat_literals = required_literals(sre_parse.parse(pat, re.IGNORECASE))
+            if pat_literals is None:
+                literals = None
+                break
+            literals |= pat_literals
+        compiled.append((str(cat_id), regex, literals))
+    return compiled
+
+
+compiled_category_rules = compile_category_rules(category_rules)
+
+
+def pick_category_from_text(text):
+    """Kategorie-ID für einen einzelnen Text (erste passende Regel) oder None."""
+    if not text:
+        return None
+    folded = fold_text(text)
+    for cat_id, regex, literals in compiled_category_rules:
+        if literals is not None and not any(lit in folded for lit in literals):
+            continue
+        if regex.search(text):
+            return cat_id
+    return None
+
+
+def category_rules_fingerprint(rules):
+    """Fingerabdruck des Regelwerks – ändert sich bei jeder Anpassung an category_rules."""
+    return hashlib.sha256(repr(rules).encode("utf-8")).hexdigest()
+
+
+# 5b. Cache für Kategorie-Zuordnungen (wird in run_conversion geladen und danach gespeichert)
+category_cache = {}
+category_fingerprint = None          # Fingerabdruck von category_rules, Teil jedes Cache-Schlüssels
+
+
+def category_cache_key(text, fingerprint):
+    """Cache-Schlüssel aus Regelwerk-Fingerabdruck und dem zu klassifizierenden Text."""
+    return hashlib.blake2b(f"{fingerprint}\x1f{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_category_cache(path, fingerprint):
+    """
+    Lädt den Kategorie-Cache von der Platte. Fehlt die Datei, ist sie defekt oder wurde
+    category_rules seitdem geändert, wird mit einem leeren Cache begonnen.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+        return {}
+    return data.get("entries", {})
+
+
+def save_category_cache(path, fingerprint, entries, max_entries, max_age_days):
+    """
+    Schreibt den Cache zurück. Unter einer Sperre werden dabei die Einträge übernommen, die andere Läufe
+    (z.B. gleichzeitige Aufträge) seit dem Laden gespeichert haben; bei gleichem Text gilt die zuletzt
+    benutzte Zuordnung. Einträge, die länger als max_age_days nicht benutzt wurden, werden verworfen;
+    bei mehr als max_entries bleiben die zuletzt benutzten erhalten.
+    """
+    min_used = time.time() - max_age_days * 86400
+    with locked(path):
+        merged = load_category_cache(path, fingerprint)
+        for key, entry in entries.items():
+            if key not in merged or entry[1] >= merged[key][1]:
+                merged[key] = entry
+        items = [(key, entry) for key, entry in merged.items() if entry[1] >= min_used]
+        if len(items) > max_entries:
+            items.sort(key=lambda item: item[1][1], reverse=True)
+            items = items[:max_entries]
+        write_json_file(path, {"fingerprint": fingerprint, "entries": dict(items)})
+
+
+def store_category_cache():
+    """Speichert den Kategorie-Cache; ein Fehler dabei bricht den Lauf nicht ab."""
+    if config.category_cache_path:
+        try:
+            save_category_cache(config.category_cache_path, category_fingerprint, category_cache,
+                                config.category_cache_max_entries, config.category_cache_max_age_days)
+        except OSError as e:
+            print(f"Hinweis: Kategorie-Cache konnte nicht gespeichert werden ({e}).")
@@ -0,0 +1,151 @@
+"""
+Mehrere Dateien (9b.): große Exporte aufteilen bzw. eine Datei je Kategorie, jede Datei wird in einem
+eigenen Worker-Prozess aus derselben Vorlage gebaut.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from . import config, dropdowns
+from .cells import iter_excel_rows
+from .columns import column_mapping
+from .dropdowns import load_dropdown_index
+from .fields import category_rule_col, shard_group_col
+from .output import init_output_worker, write_output
+
+
+# 9b. Mehrere Dateien (Aufteilen großer Exporte, eine Datei je Kategorie), jede in einem eigenen Prozess gebaut
+shard_cell_overhead = 40             # Geschätzte XML-Bytes je Zelle zusätzlich zum Text
+shard_compression_ratio = 6          # Geschätzter Faktor, um den die Kompression das Blatt verkleinert
+
+
+def group_row_positions(df):
+    """
+    Liefert die Zeilenpositionen je Warennummer in der Reihenfolge des ersten Auftretens.
+    Zeilen ohne Warennummer bilden jeweils eine eigene Gruppe.
+    """
+    if shard_group_col not in df.columns:
+        return [np.array([i]) for i in range(len(df))]
+    codes, _ = pd.factorize(df[shard_group_col])
+    codes = codes.copy()
+    missing = codes < 0
+    codes[missing] = codes.max(initial=-1) + 1 + np.arange(missing.sum())
+    order = np.argsort(codes, kind="stable")
+    return np.split(order, np.flatnonzero(np.diff(codes[order])) + 1)
+
+
+def estimate_row_bytes(df):
+    """Schätzt die komprimierte Größe jeder Zeile im Blatt aus der Textlänge der gemappten Spalten."""
+    sizes = np.zeros(len(df))
+    for csv_col in column_mapping:
+        if csv_col in df.columns:
+            codes, uniques = pd.factorize(df[csv_col])
+            lengths = np.array([len(str(value)) for value in uniques] + [0], dtype=float)[codes]
+            sizes += lengths + np.where(lengths > 0, shard_cell_overhead, 0)
+    return sizes / shard_compression_ratio
+
+
+def plan_shards(df, template_bytes):
+    """
+    Verteilt die Warennummer-Gruppen der Reihe nach auf Dateien mit höchstens shard_rows Zeilen
+    bzw. ungefähr shard_max_mb MB. Rückgabe: Liste der Zeilenpositionen je Datei.
+    """
+    max_bytes = config.shard_max_mb * 1024 * 1024 - template_bytes if config.shard_max_mb else None
+    row_bytes = estimate_row_bytes(df) if config.shard_max_mb else None
+    shards, current, current_rows, current_bytes = [], [], 0, 0.0
+    oversized = 0
+    for group in group_row_positions(df):
+        group_bytes = row_bytes[group].sum() if row_bytes is not None else 0.0
+        if config.shard_rows and len(group) > config.shard_rows:
+            oversized += 1
+        too_many = config.shard_rows and current_rows + len(group) > config.shard_rows
+        too_big = max_bytes is not None and current_bytes + group_bytes > max_bytes
+        if current and (too_many or too_big):
+            shards.append(np.concatenate(current))
+            current, current_rows, current_bytes = [], 0, 0.0
+        current.append(group)
+        current_rows += len(group)
+        current_bytes += group_bytes
+    if current:
+        shards.append(np.concatenate(current))
+    if oversized:
+        print(f"Hinweis: {oversized} Warennummern haben mehr als {config.shard_rows} Zeilen "
+              f"und wurden trotzdem nicht getrennt.\n")
+    return shards or [np.arange(0)]
+
+
+def category_partitions(df):
+    """
+    Teilt die Tabelle nach der per category_rules zugewiesenen Kategorie-ID auf:
+    [(Kategorie-ID, Teil), ..., ("ohne_Kategorie", Teil)].
+    """
+    if category_rule_col not in df.columns:
+        return [("ohne_Kategorie", df)] if len(df) else []
+    keys = df[category_rule_col]
+    parts = [(str(cat_id), part) for cat_id, part in df.groupby(keys, sort=False)]
+    unmatched = df[keys.isna()]
+    if len(unmatched):
+        parts.append(("ohne_Kategorie", unmatched))
+    return parts
+
+
+def plan_output_files(df, template_path, target_path):
+    """
+    Legt fest, welche Dateien gebaut werden: [(Dateiname, Teil-Tabelle), ...], z.B.
+    TEMU_21842.xlsx (split_by_category) oder TEMU_Teil01.xlsx (shard_rows/shard_max_mb).
+    """
+    root, ext = os.path.splitext(target_path)
+    parts = category_partitions(df) if config.split_by_category else [(None, df)]
+    template_bytes = os.path.getsize(template_path)
+    files = []
+    for name, part in parts:
+        base = f"{root}_{name}" if name else root
+        if config.shard_rows or config.shard_max_mb:
+            shards = plan_shards(part, template_bytes)
+            files.extend((f"{base}_Teil{number:02d}{ext}", part.iloc[rows])
+                         for number, rows in enumerate(shards, start=1))
+        else:
+            files.append((base + ext, part))
+    return files
+
+
+def build_output_file(template_path, output_path, df):
+    """
+    Baut eine Datei aus einer Teil-Tabelle (läuft in einem Worker-Prozess) und gibt ihren Pfad
+    und die ungültigen Zellen der Dropdown-Prüfung zurück.
+    """
+    dropdowns.dropdown_findings = []
+    dropdowns.dropdown_index = load_dropdown_index(template_path) if config.dropdown_check else None
+    write_output(template_path, output_path, iter_excel_rows([df], {}))
+    return output_path, dropdowns.dropdown_findings
+
+
+def write_output_files(files, template_path):
+    """
+    Baut alle Dateien aus plan_output_files gleichzeitig in Worker-Prozessen aus derselben Vorlage.
+    Die größten Dateien werden zuerst gestartet, damit die Gesamtzeit der größten Datei entspricht.
+    Rückgabe: {Datei: ungültige Zellen der Dropdown-Prüfung} in der Reihenfolge der Dateien.
+    """
+    workers = max(1, min(len(files), config.shard_workers or os.cpu_count() or 1))
+    settings = {
+        "excel_engine": config.excel_engine,
+        "sheet_name": config.sheet_name,
+        "start_row": config.start_row,
+        "compression_level": config.compression_level,
+        "template_snapshot_dir": config.template_snapshot_dir,
+        "dropdown_check": config.dropdown_check,
+        "dropdown_sheet_name": config.dropdown_sheet_name,
+        # Die CPU-Kerne für die Kompression auf die Worker verteilen statt sie zu überbuchen
+        "compression_threads": max(1, (config.compression_threads or os.cpu_count() or 1) // workers),
+    }
+    print(f"Baue die Dateien in {workers} Prozess(en) gleichzeitig ...")
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_output_worker, initargs=(settings,)) as pool:
+        futures = {pool.submit(build_output_file, template_path, path, part): len(part)
+                   for path, part in sorted(files, key=lambda file: len(file[1]), reverse=True)}
+        results = {}
+        for future in as_completed(futures):
+            path, findings = future.result()
+            results[path] = findings
+            print(f"  -> {os.path.basename(path)} fertig ({futures[future]} Zeilen).")
+    print()
+    return {path: results[path] for path, _ in files}
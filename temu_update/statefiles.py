@@ -0,0 +1,60 @@
+"""
+Zustandsdateien im Cache-Ordner (Kategorie-Cache, Delta-Stand): atomar schreiben und gemeinsam benutzte
+Dateien sperren, damit gleichzeitige Läufe bzw. Aufträge sich nicht gegenseitig Einträge überschreiben.
+Nur Standardbibliothek.
+"""
+import os
+import json
+import time
+import tempfile
+import contextlib
+
+lock_timeout_s = 60                  # So lange wird höchstens auf eine Sperre gewartet
+lock_stale_s = 300                   # Ältere Sperrdateien stammen von abgebrochenen Läufen und werden entfernt
+
+
+def write_json_file(path, data):
+    """
+    Schreibt data als kompaktes JSON über eine eigene temporäre Datei im selben Ordner (mkstemp) und
+    ersetzt path erst danach, sodass nie eine halb geschriebene Datei an ihrer Stelle liegt.
+    """
+    target_dir = os.path.dirname(path) or "."
+    os.makedirs(target_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=target_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
+@contextlib.contextmanager
+def locked(path):
+    """
+    Sperrt path für andere Prozesse (Sperrdatei path + ".lock", mit O_EXCL angelegt), z.B. für Lesen,
+    Zusammenführen und Schreiben des Kategorie-Caches in einem Zug.
+    """
+    lock_path = path + ".lock"
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    deadline = time.monotonic() + lock_timeout_s
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            with contextlib.suppress(OSError):
+                if time.time() - os.path.getmtime(lock_path) > lock_stale_s:
+                    os.remove(lock_path)
+                    continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Datei '{path}' ist seit {lock_timeout_s} s von einem anderen Lauf gesperrt "
+                                   f"(ggf. '{lock_path}' löschen).")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(lock_path)
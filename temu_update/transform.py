@@ -0,0 +1,434 @@
+"""
+Umwandlung der CSV (Schritte 2 bis 5.3): einlesen, Standardwerte, Länder, Maße, Artikelanzahl,
+Kategorien, Filter und Delta-Abgleich. Jeder Schritt ist eine Funktion df -> df.
+"""
+import re
+import json
+import time
+import hashlib
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from . import config, rules
+from .columns import column_mapping
+from .fields import (category_rule_col, category_text_cols, country_map, delta_key_cols, filter_terms,
+                     mm_to_cm_cols, placeholder_values, required_cols, sum_stueckzahlen)
+from .report import count_up, run_stage
+from .rules import casefold_fixes, category_cache_key, category_rules, compiled_category_rules
+from .statefiles import write_json_file
+
+
+# 2. CSV einlesen (Semikolon-separiert)
+def read_csv_chunks(path, chunk_size, usecols=None):
+    """
+    Liest die CSV als Folge von DataFrames ein: ohne chunk_size in einem Stück,
+    sonst blockweise mit höchstens chunk_size Zeilen. usecols = Positionen der einzulesenden Spalten (None = alle).
+    """
+    if not chunk_size:
+        yield pd.read_csv(path, sep=";", encoding="utf-8", dtype=csv_dtypes(), usecols=usecols)
+        return
+    with pd.read_csv(path, sep=";", encoding="utf-8", dtype=csv_dtypes(), usecols=usecols,
+                     chunksize=chunk_size) as reader:
+        yield from reader
+
+
+# 2.1 Spalten mit wenigen unterschiedlichen Werten als Kategorie (pandas category) halten.
+#     Spalten, die die Schritte überschreiben, bleiben Text (neue Werte müssten sonst erst als Kategorie rein)
+categorical_skip_cols = ["Anzahl", "Nicht verfügbar für Listenpreis", *mm_to_cm_cols, "Kategorie"]
+categorical_sample_rows = 1000       # Vorprüfung der automatischen Erkennung an den ersten Zeilen
+
+
+def csv_dtypes():
+    """Einlese-Typen: alles als Text, die Spalten aus config.categorical_cols direkt als Kategorie."""
+    kinds = {col: "category" for col in config.categorical_cols if col not in categorical_skip_cols}
+    return defaultdict(lambda: str, kinds)
+
+
+def is_categorical(series):
+    """True für Spalten mit pandas-Kategorie als Typ."""
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def as_text(series):
+    """Kategorie-Spalten als einfache Textspalte (für Verkettungen), alle anderen unverändert."""
+    return series.astype(object) if is_categorical(series) else series
+
+
+def text_mask(series, test):
+    """
+    Wendet test (Text-Series -> bool-Series) auf die Werte an, fehlende Werte als "". Bei Kategorie-Spalten
+    wird nur einmal je Kategorie geprüft und das Ergebnis über die Codes auf die Zeilen verteilt.
+    """
+    if not is_categorical(series):
+        return test(series.fillna("").astype(str))
+    values = pd.Series([*series.cat.categories, ""], dtype=object).astype(str)
+    hits = test(values).to_numpy()
+    return pd.Series(hits[series.cat.codes.to_numpy()], index=series.index)  # Code -1 (fehlt) -> ""
+
+
+def use_categorical_dtypes(df, notes):
+    """
+    Stellt weitere Textspalten auf Kategorie um, wenn höchstens categorical_max_share ihrer Werte verschieden
+    sind. Eine Stichprobe der ersten Zeilen sortiert Spalten wie SKU-ID oder Beschreibungen vorab aus.
+    """
+    share = config.categorical_max_share
+    if share is not None and len(df):
+        for col in df.columns:
+            if is_categorical(df[col]) or col in categorical_skip_cols or not pd.api.types.is_string_dtype(df[col]):
+                continue
+            sample = df[col].iloc[:categorical_sample_rows]
+            if sample.nunique() > share * len(sample):
+                continue
+            values = df[col].astype("category")
+            if len(values.cat.categories) <= share * len(df):
+                df[col] = values
+    if notes:
+        cols = [col for col in df.columns if is_categorical(df[col])]
+        if cols:
+            print(f"Als Kategorie eingelesen ({len(cols)} Spalten): {', '.join(cols)}\n")
+    return df
+
+
+# 2a. Standardwerte für bestimmte Spalten setzen
+def apply_defaults(df, notes):
+    """Setzt leere 'Anzahl' auf 1 und leere 'Nicht verfügbar für Listenpreis' auf N/A."""
+    # Anzahl: falls leer, auf "1" setzen
+    if "Anzahl" in df.columns:
+        df["Anzahl"] = df["Anzahl"].fillna("1").replace("", "1")
+        if notes:
+            print("Leere Werte in 'Anzahl' wurden auf 1 gesetzt.\n")
+    else:
+        df["Anzahl"] = "1"
+        if notes:
+            print("Spalte 'Anzahl' fehlte. Sie wurde mit dem Standardwert 1 hinzugefügt.\n")
+
+    # "Nicht verfügbar für Listenpreis": falls leer, auf "N/A" setzen
+    if "Nicht verfügbar für Listenpreis" in df.columns:
+        df["Nicht verfügbar für Listenpreis"] = df["Nicht verfügbar für Listenpreis"].fillna("N/A")
+        if notes:
+            print("Leere Werte in 'Nicht verfügbar für Listenpreis' wurden zu 'N/A' geändert.\n")
+    elif notes:
+        print("Hinweis: Spalte 'Nicht verfügbar für Listenpreis' nicht in der CSV gefunden.\n")
+    return df
+
+
+# 3. Werte konvertieren (z.B. Ursprungsland übersetzen nach country_map, Maßeinheiten umrechnen)
+def translate_countries(df, notes):
+    """Übersetzt 'Ursprungsland/-region' nach country_map."""
+    if "Ursprungsland/-region" in df.columns:
+        translate = lambda x: country_map.get(str(x).strip(), str(x).strip()) if pd.notna(x) else x
+        values = df["Ursprungsland/-region"]
+        if is_categorical(values):
+            # Nur einmal je Kategorie übersetzen; fallen Werte zusammen (Deutschland/Germany), neu gruppieren
+            df["Ursprungsland/-region"] = values.map(translate, na_action="ignore").astype("category")
+        else:
+            df["Ursprungsland/-region"] = values.apply(translate)
+        if notes:
+            print("Spalte 'Ursprungsland/-region' nach Vorgaben übersetzt.\n")
+    elif notes:
+        print("Hinweis: Spalte 'Ursprungsland/-region' nicht in der CSV gefunden.\n")
+    return df
+
+
+# Maße von mm in cm umrechnen (Minimum 1 cm)
+def convert_dimensions(df, notes):
+    """Rechnet die Maß-Spalten von mm in ganze cm um (ungültig/zu klein -> 1)."""
+    if notes:
+        print("Konvertiere Maße von mm in cm (mindestens 1 cm)...")
+    for col in mm_to_cm_cols:
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors="coerce") / 10.0
+            # Ungültige Werte auf 1 setzen, Minimum 1
+            values = values.fillna(1).clip(lower=1)
+            # Auf ganze cm runden und als int speichern
+            df[col] = values.round(0).astype(int)
+            if notes:
+                print(f"  -> Spalte '{col}': Umrechnung mm → cm durchgeführt (Min. 1).")
+        elif notes:
+            print(f"  -> Hinweis: Spalte '{col}' ist in der CSV nicht vorhanden.")
+    if notes:
+        print()  # Leerzeile
+    return df
+
+
+# 4. Gesamtanzahl Artikel aus Stückzahlen berechnen (sum_stueckzahlen je Wert)
+def compute_artikel(df, notes):
+    """Berechnet 'Artikel' aus den Stückzahlen in 'Gesamtartikelanzahl'."""
+    if notes:
+        print("Berechne Gesamtartikelanzahl aus einzelnen Stückzahlen...")
+    if "Gesamtartikelanzahl" in df.columns:
+        df["Artikel"] = df["Gesamtartikelanzahl"].apply(sum_stueckzahlen)
+        if notes:
+            print("Spalte 'Artikel' wurde aus 'Gesamtartikelanzahl' berechnet.\n")
+    elif notes:
+        print("Hinweis: Spalte 'Gesamtartikelanzahl' nicht in der CSV gefunden.\n")
+    return df
+
+
+# 5. Kategorie-Automatisierung: Regeln anwenden (die Regeln selbst stehen in rules.py)
+def assign_categories(texts):
+    """
+    Ordnet einer ganzen Text-Spalte die Kategorie-IDs zu: pro Regel ein Durchlauf über alle
+    noch offenen Zeilen, die laut Vorfilter in Frage kommen. Die erste passende Regel gewinnt.
+    Gibt eine Series mit der Kategorie-ID (str) bzw. None je Zeile zurück.
+    """
+    result = pd.Series(None, index=texts.index, dtype=object)
+    texts = texts.fillna("")
+    folded = texts.str.translate(casefold_fixes).str.lower()
+    open_rows = texts != ""
+    literal_hits = {}
+    for number, (cat_id, regex, literals) in enumerate(compiled_category_rules):
+        if not open_rows.any():
+            break
+        started = time.perf_counter()
+        candidates = open_rows.copy()
+        if literals is not None:
+            hits = pd.Series(False, index=texts.index)
+            for lit in literals:
+                if lit not in literal_hits:
+                    literal_hits[lit] = folded.str.contains(lit, regex=False)
+                hits |= literal_hits[lit]
+            candidates &= hits
+        matched_idx = texts.index[:0]
+        if candidates.any():
+            matched = texts[candidates].map(regex.search).notna()
+            matched_idx = matched.index[matched.to_numpy()]
+        if config.category_profile:
+            profile_rule(number, texts[candidates], int(open_rows.sum()), len(matched_idx),
+                         time.perf_counter() - started)
+        result.loc[matched_idx] = cat_id
+        open_rows.loc[matched_idx] = False
+    return result
+
+
+# 5a. Regel-Profil (category_profile): Treffer und Zeit je Regel und je Muster, um teure oder nie
+#     treffende Muster zu finden. Die Muster werden dafür zusätzlich einzeln auf die Kandidaten angewendet.
+rule_profile = []                    # Je Regel: Zähler und Zeiten, darin je Muster dasselbe
+rule_profile_regexes = []            # Je Regel die einzeln kompilierten Muster
+
+
+def reset_rule_profile():
+    """Legt das Regel-Profil für einen neuen Lauf leer an."""
+    rule_profile[:] = [{"kategorie": str(cat_id), "regel": name, "offen": 0, "geprueft": 0, "treffer": 0,
+                        "zeit_s": 0.0,
+                        "muster": [{"muster": pat, "geprueft": 0, "treffer": 0, "zeit_s": 0.0} for pat in patterns]}
+                       for cat_id, name, patterns in category_rules]
+    if not rule_profile_regexes:
+        rule_profile_regexes[:] = [[re.compile(pat, flags=re.IGNORECASE) for pat in patterns]
+                                   for _, _, patterns in category_rules]
+
+
+def profile_rule(number, candidate_texts, rows_open, rows_matched, seconds):
+    """
+    Verbucht einen Durchlauf der Regel number: offen = noch nicht zugeordnete Zeilen, geprüft = davon
+    nach dem Stichwort-Vorfilter, Zeit = Vorfilter plus gemeinsamer Regex. Danach jedes Muster einzeln.
+    """
+    entry = rule_profile[number]
+    entry["offen"] += rows_open
+    entry["geprueft"] += len(candidate_texts)
+    entry["treffer"] += rows_matched
+    entry["zeit_s"] += seconds
+    for pattern_entry, regex in zip(entry["muster"], rule_profile_regexes[number]):
+        started = time.perf_counter()
+        hits = int(candidate_texts.map(regex.search).notna().sum()) if len(candidate_texts) else 0
+        pattern_entry["zeit_s"] += time.perf_counter() - started
+        pattern_entry["geprueft"] += len(candidate_texts)
+        pattern_entry["treffer"] += hits
+
+
+def print_rule_profile():
+    """Gibt das Regel-Profil als Rangliste aus: Regeln und Muster jeweils nach Zeit sortiert."""
+    print("Regel-Profil (teuerste zuerst):")
+    print(f"  {'Rang':>4}  {'Kategorie':<9}  {'Regel':<40} {'offen':>8} {'geprüft':>8} {'Treffer':>8} {'ms':>9}")
+    ranked = sorted(rule_profile, key=lambda entry: entry["zeit_s"], reverse=True)
+    for rank, entry in enumerate(ranked, start=1):
+        print(f"  {rank:>4}  {entry['kategorie']:<9}  {entry['regel'][:40]:<40} {entry['offen']:>8} "
+              f"{entry['geprueft']:>8} {entry['treffer']:>8} {entry['zeit_s'] * 1000:>9.1f}")
+    print("\nMuster (einzeln gemessen, teuerste zuerst; Treffer auch dort, wo ein anderes Muster der Regel passt):")
+    print(f"  {'Rang':>4}  {'Kategorie':<9}  {'Muster':<48} {'geprüft':>8} {'Treffer':>8} {'ms':>9}")
+    patterns = [(entry["kategorie"], pattern) for entry in rule_profile for pattern in entry["muster"]]
+    patterns.sort(key=lambda item: item[1]["zeit_s"], reverse=True)
+    for rank, (cat_id, pattern) in enumerate(patterns, start=1):
+        dead = "  nie getroffen" if not pattern["treffer"] else ""
+        print(f"  {rank:>4}  {cat_id:<9}  {pattern['muster'][:48]:<48} {pattern['geprueft']:>8} "
+              f"{pattern['treffer']:>8} {pattern['zeit_s'] * 1000:>9.1f}{dead}")
+    print()
+
+
+def assign_categories_cached(texts, stats):
+    """
+    Wie assign_categories, aber über den Kategorie-Cache: gleiche Texte werden nur einmal
+    und bereits bekannte Texte gar nicht mehr klassifiziert.
+    """
+    codes, uniques = pd.factorize(texts.fillna(""))
+    now = time.time()
+    results = [None] * len(uniques)
+    keys = [category_cache_key(text, rules.category_fingerprint) for text in uniques]
+    missing = []
+    for i, key in enumerate(keys):
+        entry = rules.category_cache.get(key)
+        if entry is None:
+            missing.append(i)
+        else:
+            results[i] = entry[0]
+            entry[1] = now
+    if missing:
+        found = assign_categories(pd.Series([uniques[i] for i in missing], dtype=object))
+        for i, cat_id in zip(missing, found.tolist()):
+            results[i] = cat_id
+            rules.category_cache[keys[i]] = [cat_id, now]
+    count_up(stats, "cache_texte", len(uniques))
+    count_up(stats, "cache_neu", len(missing))
+    return pd.Series([results[code] for code in codes], index=texts.index, dtype=object)
+
+
+def categorize(df, stats, notes):
+    """Setzt 'Kategorie' anhand von Beschreibung, Name und Kategoriename."""
+    if "Kategorie" in df.columns:
+        # Kategorie anhand relevanter Texte zuordnen (Beschreibung, Name, Kategoriename)
+        text = pd.Series("", index=df.index)
+        for col in category_text_cols:
+            if col in df.columns:
+                text = text + (" " + as_text(df[col])).fillna("")
+        if config.category_cache_path and not config.category_profile:
+            cat_ids = assign_categories_cached(text, stats)
+        else:
+            cat_ids = assign_categories(text)
+        assigned = cat_ids.notna()
+        df.loc[assigned, "Kategorie"] = cat_ids[assigned]
+        df[category_rule_col] = cat_ids  # wird nicht geschrieben, nur für split_by_category
+        count_up(stats, "kategorie_gesetzt", int(assigned.sum()))
+    elif notes:
+        print("Hinweis: Spalte 'Kategorie' nicht in der CSV gefunden – Automatisierung übersprungen.\n")
+    return df
+
+
+# 5.1 Filter: Produkte aus bestimmten Kategorien (filter_terms) nicht übertragen
+def filter_categories(df, stats, notes):
+    """Entfernt Produkte, deren Kategorie(-name) einen der filter_terms enthält."""
+    if "Kategorie" in df.columns or "Kategoriename" in df.columns:
+        mask = pd.Series(False, index=df.index)
+        pattern = "|".join(filter_terms)
+        for col in ("Kategorie", "Kategoriename"):
+            if col in df.columns:
+                mask |= text_mask(df[col], lambda vals: vals.str.lower().str.contains(pattern))
+        count_up(stats, "kategorie_filter_vorher", len(df))
+        count_up(stats, "kategorie_filter_ignoriert", int(mask.sum()))
+        # Keine Kopie nötig: danach wird der Block nur noch gelesen
+        df = df.loc[~mask]
+    elif notes:
+        print("Hinweis: Keine Kategorie-Spalte vorhanden – Kategorie-Filter übersprungen.\n")
+    return df
+
+
+# 5.2 Produkte ohne wichtige Angaben (Identifikation, Preis, Bild) ignorieren
+def is_placeholder(vals):
+    """True für leere Werte und Platzhalter wie 'n/a' oder '999.99'."""
+    vals = vals.str.strip().str.lower()
+    return (vals == "") | (vals.isin(placeholder_values))
+
+
+def filter_incomplete(df, stats, notes):
+    """Entfernt Produkte ohne Produktidentifikation, Preis oder SKU-Bild."""
+    if any(col in df.columns for col in required_cols):
+        missing_mask = pd.Series(False, index=df.index)
+        for col in required_cols:
+            if col in df.columns:
+                missing_mask |= text_mask(df[col], is_placeholder)
+        count_up(stats, "unvollstaendig_vorher", len(df))
+        count_up(stats, "unvollstaendig_ignoriert", int(missing_mask.sum()))
+        df = df.loc[~missing_mask]
+    elif notes:
+        print("Hinweis: Spalten für Produktidentifikation/Preis/Bild fehlen – Überprüfung übersprungen.\n")
+    return df
+
+
+# 5.3 Delta-Modus: Produkte, deren gemappte Felder sich seit dem letzten Lauf nicht geändert haben, auslassen
+delta_state = None                   # Stand des letzten Laufs (wird in run_conversion geladen)
+delta_updates = []                   # Fingerabdrücke dieses Laufs, je Block eine Series
+
+
+def delta_state_fingerprint():
+    """Ändert sich das Spalten-Mapping (oder pandas' Hashfunktion), gilt der alte Stand nicht mehr."""
+    return hashlib.sha256(repr((column_mapping, pd.__version__)).encode("utf-8")).hexdigest()
+
+
+def load_delta_state(path, fingerprint):
+    """Lädt den Stand des letzten Laufs als Series SKU -> Fingerabdruck (uint64)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = None
+    if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+        return pd.Series([], dtype=np.uint64)
+    entries = data.get("produkte", {})
+    return pd.Series(np.fromiter(entries.values(), dtype=np.uint64, count=len(entries)),
+                     index=pd.Index(list(entries), dtype=object))
+
+
+def save_delta_state(path, fingerprint, state, updates):
+    """Schreibt den Stand zurück: bisherige Einträge plus die Fingerabdrücke dieses Laufs."""
+    merged = pd.concat([state, *updates])
+    merged = merged[~merged.index.duplicated(keep="last")]
+    write_json_file(path, {"fingerprint": fingerprint,
+                           "produkte": dict(zip(merged.index, merged.to_numpy().tolist()))})
+
+
+def delta_keys(df):
+    """SKU je Zeile: SKU-ID, ersatzweise Verkäufer SKU (None, wenn keine der Spalten vorhanden ist)."""
+    keys = None
+    for col in delta_key_cols:
+        if col in df.columns:
+            values = df[col].astype(object).where(df[col].notna() & (df[col].astype(str).str.strip() != ""))
+            keys = values if keys is None else keys.fillna(values)
+    return keys
+
+
+def filter_unchanged(df, stats, notes):
+    """
+    Berechnet je Zeile einen Fingerabdruck aller gemappten Felder (vektorisiert) und merkt ihn für
+    den nächsten Lauf vor. Im Delta-Modus werden Zeilen mit unverändertem Fingerabdruck entfernt;
+    der Abgleich mit dem letzten Stand ist ein Hash-Join über den SKU-Index.
+    """
+    if delta_state is None:
+        return df
+    keys = delta_keys(df)
+    if keys is None:
+        if notes:
+            print("Hinweis: Spalten 'SKU-ID'/'Verkäufer SKU' fehlen – Delta-Abgleich übersprungen.\n")
+        return df
+    cols = [col for col in column_mapping if col in df.columns]
+    hashes = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+    known = keys.notna().to_numpy()
+    known_keys = keys.to_numpy()[known]
+    delta_updates.append(pd.Series(hashes[known], index=pd.Index(known_keys, dtype=object)))
+    if not config.delta_mode:
+        return df
+    positions = delta_state.index.get_indexer(known_keys)
+    found = positions >= 0
+    unchanged_known = np.zeros(len(known_keys), dtype=bool)
+    unchanged_known[found] = delta_state.to_numpy()[positions[found]] == hashes[known][found]
+    unchanged = np.zeros(len(df), dtype=bool)
+    unchanged[known] = unchanged_known
+    count_up(stats, "delta_vorher", len(df))
+    count_up(stats, "delta_unveraendert", int(unchanged.sum()))
+    return df.loc[~unchanged]
+
+
+def transform_chunk(df, stats, notes):
+    """
+    Führt alle Umwandlungen und Filter (Schritte 2a bis 5.3) für einen Block der CSV aus.
+    Hinweise zu fehlenden Spalten werden nur bei notes=True ausgegeben.
+    """
+    count_up(stats, "gelesen", len(df))
+    df = run_stage("spaltentypen", use_categorical_dtypes, df, notes)
+    df = run_stage("standardwerte", apply_defaults, df, notes)
+    df = run_stage("laender", translate_countries, df, notes)
+    df = run_stage("masse_mm_cm", convert_dimensions, df, notes)
+    df = run_stage("gesamtartikelanzahl", compute_artikel, df, notes)
+    df = run_stage("kategorien", categorize, df, stats, notes)
+    df = run_stage("filter_kategorien", filter_categories, df, stats, notes)
+    df = run_stage("filter_unvollstaendig", filter_incomplete, df, stats, notes)
+    df = run_stage("delta", filter_unchanged, df, stats, notes)
+    return df
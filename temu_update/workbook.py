@@ -0,0 +1,163 @@
+"""
+openpyxl-Schreibweg (8./9.): die komplette Mappe wird geladen, geleert, beschrieben und gespeichert.
+Wird nur importiert, wenn excel_engine = "openpyxl" ist.
+"""
+import os
+import pickle
+import zlib
+import zipfile
+import tempfile
+from copy import copy
+from concurrent.futures import ThreadPoolExecutor
+from openpyxl import __version__ as openpyxl_version, load_workbook
+from openpyxl.formatting.formatting import ConditionalFormattingList
+from openpyxl.worksheet.dimensions import RowDimension
+from openpyxl.writer.excel import ExcelWriter
+from . import config
+from .columns import mapped_column_indices
+from .report import measure_stage
+from .xml_engine import extend_range_list, read_template_snapshot, template_snapshot_path, write_template_snapshot
+from .ziptools import deflate_block, deflate_block_size, replace_with_temp, zip_finish, zip_write_entry
+
+
+def clear_old_rows(ws):
+    """
+    Leert alle gemappten Spalten ab start_row. Es werden nur tatsächlich vorhandene Zellen
+    angefasst, statt für jede Spalte bis ws.max_row neue leere Zellen anzulegen: Zellen ohne
+    eigene Formatierung werden entfernt, formatierte Zellen behalten ihr Format.
+    """
+    print(f"Lösche alte Einträge in Excel ab Zeile {config.start_row}...")
+    used_cols = mapped_column_indices()
+    # openpyxl verwaltet die vorhandenen Zellen als Dict (Zeile, Spalte) -> Zelle
+    stale = [key for key in ws._cells if key[0] >= config.start_row and key[1] in used_cols]
+    for key in stale:
+        cell = ws._cells[key]
+        if cell.has_style:
+            cell.value = None
+        else:
+            del ws._cells[key]
+    print(f"Alte Daten wurden entfernt ({len(stale)} Zellen).\n")
+
+
+def write_rows(ws, rows):
+    """Schreibt die Zeilen aus iter_excel_rows per openpyxl ins Blatt. Gibt die letzte Zeilennummer zurück."""
+    last_row = config.start_row - 1
+    for excel_row, cells in rows:
+        for col_idx, cell_value in cells:
+            ws.cell(row=excel_row, column=col_idx, value=cell_value)
+        last_row = excel_row
+    return last_row
+
+
+def extend_template_rows(ws, template_end, last_row):
+    """
+    Zeilen nach dem Vorlagenende (openpyxl-Weg): Formeln/Formate und Zeilenhöhe der letzten Vorlagenzeile übernehmen
+    und Datenüberprüfungen sowie bedingte Formate bis last_row verlängern.
+    """
+    if last_row <= template_end:
+        return
+    cleared_cols = mapped_column_indices()
+    prototype = [cell for (row, col), cell in ws._cells.items() if row == template_end and col not in cleared_cols]
+    row_format = ws.row_dimensions[template_end] if template_end in ws.row_dimensions else None
+    for excel_row in range(template_end + 1, last_row + 1):
+        if row_format is not None:
+            # Zeilenhöhe und Zeilenformat wie beim XML-Weg (der das Zeilen-Tag der letzten Vorlagenzeile kopiert)
+            dimension = RowDimension(ws, index=excel_row, ht=row_format.ht, hidden=row_format.hidden)
+            dimension._style = copy(row_format._style)
+            ws.row_dimensions[excel_row] = dimension
+        for cell in prototype:
+            new_cell = ws.cell(row=excel_row, column=cell.column, value=cell.value)
+            new_cell._style = copy(cell._style)
+    for validation in ws.data_validations.dataValidation:
+        validation.sqref = extend_range_list(str(validation.sqref), template_end, last_row)
+    formats = ConditionalFormattingList()
+    for cf in ws.conditional_formatting:
+        for rule in cf.rules:
+            formats.add(extend_range_list(str(cf.sqref), template_end, last_row), rule)
+    ws.conditional_formatting = formats
+
+
+def compress_member_async(data, pool):
+    """Startet die blockweise Kompression eines kompletten ZIP-Eintrags im Pool (Liste von Futures)."""
+    futures = []
+    for start in range(0, len(data), deflate_block_size):
+        zdict = data[max(0, start - 32768):start]
+        block = data[start:start + deflate_block_size]
+        futures.append(pool.submit(deflate_block, block, config.compression_level, zdict, False))
+    futures.append(pool.submit(deflate_block, b"", config.compression_level, b"", True))
+    return futures
+
+
+def save_workbook_parallel(wb, path, template_path):
+    """
+    Ersatz für wb.save(path): openpyxl schreibt die Teile unkomprimiert in eine temporäre Datei,
+    danach werden alle Teile gleichzeitig im Thread-Pool mit compression_level komprimiert.
+    """
+    threads = config.compression_threads or os.cpu_count() or 1
+    out_dir = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=out_dir)
+    try:
+        with tempfile.TemporaryFile() as stored:
+            ExcelWriter(wb, zipfile.ZipFile(stored, "w", zipfile.ZIP_STORED, allowZip64=True)).save()
+            stored.seek(0)
+            with zipfile.ZipFile(stored) as zin, os.fdopen(fd, "wb") as out, \
+                    ThreadPoolExecutor(max_workers=threads) as pool:
+                members = []
+                for info in zin.infolist():
+                    data = zin.read(info)
+                    members.append((info, zlib.crc32(data), len(data), compress_member_async(data, pool)))
+                central = []
+                for info, crc, size, futures in members:
+                    parts = [future.result() for future in futures]
+                    zip_write_entry(out, central, info.filename, zipfile.ZIP_DEFLATED, crc,
+                                    sum(map(len, parts)), size, info.date_time, info.flag_bits, parts)
+                zip_finish(out, central)
+        replace_with_temp(tmp_path, path, template_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_template_workbook(template_path, save_snapshot=True):
+    """
+    load_workbook über den Vorlagen-Snapshot: die frisch geladene Mappe wird gepickelt gespeichert
+    (je openpyxl-Version) und lädt beim nächsten Lauf etwa dreimal so schnell.
+    """
+    if not config.template_snapshot_dir:
+        return load_workbook(template_path)
+    snapshot_path = template_snapshot_path(template_path, f"openpyxl-{openpyxl_version}.pickle")
+    wb = read_template_snapshot(snapshot_path, pickle.load)
+    if wb is None:
+        wb = load_workbook(template_path)
+        if save_snapshot:
+            write_template_snapshot(snapshot_path,
+                                    lambda data, f: pickle.dump(data, f, pickle.HIGHEST_PROTOCOL), wb)
+    return wb
+
+
+def write_workbook_openpyxl(template_path, output_path, rows):
+    """
+    openpyxl-Schreibweg: komplette Mappe laden, gemappte Spalten leeren, Zeilen schreiben und
+    parallel komprimiert speichern.
+    """
+    # Excel-Vorlage öffnen und Ziel-Tabelle auswählen
+    print("Öffne Excel-Datei...")
+    in_place = os.path.abspath(template_path) == os.path.abspath(output_path)
+    with measure_stage("vorlage_laden"):
+        wb = load_template_workbook(template_path, not in_place)
+    if config.sheet_name not in wb.sheetnames:
+        raise ValueError(f"Tabellenblatt '{config.sheet_name}' wurde in der Excel-Datei nicht gefunden.")
+    ws = wb[config.sheet_name]
+    print(f"Tabellenblatt '{config.sheet_name}' erfolgreich geladen.\n")
+    template_end = ws.max_row
+
+    with measure_stage("leeren"):
+        clear_old_rows(ws)
+
+    print("Schreibe neue Daten in die Excel-Datei...")
+    with measure_stage("schreiben"):
+        extend_template_rows(ws, template_end, write_rows(ws, rows))
+    print("Schreiben der neuen Daten abgeschlossen.\n")
+    with measure_stage("speichern"):
+        save_workbook_parallel(wb, output_path, template_path)
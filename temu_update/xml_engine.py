@@ -0,0 +1,330 @@
+"""
+Direkter XML-Schreibweg (9a.) und Vorlagen-Snapshots. Braucht weder pandas noch openpyxl.
+"""
+import os
+import re
+import json
+import time
+import zlib
+import hashlib
+import zipfile
+import tempfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from . import config
+from .columns import col_letter_of, column_index, mapped_column_indices, range_bounds
+from .report import measure_stage
+from .ziptools import (crc32_combine, deflate_block, deflate_parallel, iter_byte_blocks, read_raw_member,
+                       replace_with_temp, zip_finish, zip_write_entry)
+
+# 9a. Direkter XML-Schreibweg: nur das Template-Blatt wird neu erzeugt (Zeile für Zeile gestreamt),
+#     alle anderen Teile der xlsx-Datei werden als rohe, komprimierte Bytes kopiert.
+xml_illegal_chars = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+sheet_row_re = re.compile(r"<row\b[^>]*?(?:/>|>.*?</row>)", re.S)
+sheet_cell_re = re.compile(r"<c\b[^>]*?(?:/>|>.*?</c>)", re.S)
+cell_ref_re = re.compile(r'\sr="([A-Z]+)\d*"')
+row_ref_re = re.compile(r'\sr="(\d+)"')
+sqref_re = re.compile(r'sqref="([^"]*)"')
+
+
+def find_sheet_part(zin, name):
+    """Ermittelt den Pfad des Tabellenblatts 'name' im Archiv (z.B. xl/worksheets/sheet5.xml)."""
+    ns_main = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+    ns_rel = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+    workbook = ET.fromstring(zin.read("xl/workbook.xml"))
+    rel_id = None
+    for sheet in workbook.iter(f"{ns_main}sheet"):
+        if sheet.get("name") == name:
+            rel_id = sheet.get(f"{ns_rel}id")
+    if rel_id is None:
+        raise ValueError(f"Tabellenblatt '{name}' wurde in der Excel-Datei nicht gefunden.")
+    rels = ET.fromstring(zin.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels:
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            return target.lstrip("/") if target.startswith("/") else "xl/" + target
+    raise ValueError(f"Tabellenblatt '{name}' ist in der Excel-Datei nicht verknüpft.")
+
+
+def split_sheet_xml(xml):
+    """
+    Zerlegt das Blatt-XML in Kopf (bis einschließlich <sheetData>), die Zeilen als
+    [(Zeilennummer, Zeilen-XML), ...] und den Rest ab </sheetData>.
+    """
+    start = xml.index("<sheetData")
+    open_end = xml.index(">", start)
+    if xml[open_end - 1] == "/":  # leeres <sheetData/>
+        return xml[:start] + "<sheetData>", [], "</sheetData>" + xml[open_end + 1:]
+    end = xml.index("</sheetData>", open_end)
+    rows = []
+    row_num = 0
+    for match in sheet_row_re.finditer(xml, open_end + 1, end):
+        row_xml = match.group(0)
+        ref = row_ref_re.search(row_xml[:row_xml.index(">")])
+        row_num = int(ref.group(1)) if ref else row_num + 1
+        rows.append((row_num, row_xml))
+    return xml[:open_end + 1], rows, xml[end:]
+
+
+def template_row_cells(row_xml):
+    """Zerlegt eine Vorlagenzeile in öffnendes Tag und die Zellen [(Spaltenindex, Zellen-XML), ...]."""
+    tag_end = row_xml.index(">")
+    open_tag = row_xml[:tag_end + 1]
+    if open_tag.endswith("/>"):
+        return open_tag[:-2].rstrip() + ">", []
+    cells = []
+    col_idx = 0
+    for cell_xml in sheet_cell_re.findall(row_xml, tag_end + 1, len(row_xml) - len("</row>")):
+        ref = cell_ref_re.search(cell_xml[:cell_xml.index(">")])
+        col_idx = column_index(ref.group(1)) if ref else col_idx + 1
+        cells.append((col_idx, cell_xml))
+    return open_tag, cells
+
+
+def cell_xml(col_idx, excel_row, value):
+    """Erzeugt eine Zelle als Inline-String (sharedStrings.xml bleibt dadurch unverändert)."""
+    text = xml_illegal_chars.sub("", str(value))
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<c r="{col_letter_of(col_idx)}{excel_row}" t="inlineStr"><is><t{space}>{text}</t></is></c>'
+
+
+def build_row_xml(excel_row, open_tag, kept_cells, new_cells):
+    """Setzt eine Zeile aus den behaltenen Vorlagenzellen und den neuen Werten zusammen."""
+    # Neue Zellen kommen bereits nach Spalte sortiert; nur beim Mischen mit Vorlagenzellen wird sortiert
+    cells = [(col_idx, cell_xml(col_idx, excel_row, value))
+             for col_idx, value in new_cells if value is not None and value != ""]
+    if kept_cells:
+        cells.extend(kept_cells)
+        cells.sort(key=lambda cell: cell[0])
+    if open_tag is None:
+        open_tag = f'<row r="{excel_row}">'
+    else:
+        open_tag = re.sub(r'\sspans="[^"]*"', "", open_tag)  # Spans stimmen nach dem Schreiben nicht mehr
+    return open_tag + "".join(xml for _, xml in cells) + "</row>"
+
+
+def repeat_template_row(prototype, excel_row):
+    """Überträgt eine Vorlagenzeile (Zeilenformat und behaltene Zellen, z.B. Formel in F) auf excel_row."""
+    open_tag, kept = prototype
+    open_tag = row_ref_re.sub(f' r="{excel_row}"', open_tag, count=1)
+    kept = [(col_idx, cell_ref_re.sub(lambda ref: f' r="{ref.group(1)}{excel_row}"', xml, count=1))
+            for col_idx, xml in kept]
+    return open_tag, kept
+
+
+def iter_sheet_rows(template_rows, data_rows, cleared_cols, last_row):
+    """
+    Führt die Vorlagenzeilen und die neuen Datenzeilen in Zeilenreihenfolge zusammen.
+    Ab start_row werden die gemappten Spalten der Vorlage geleert (wie clear_old_rows).
+    Zeilen nach dem Ende der Vorlage erhalten Format und Formeln der letzten Vorlagenzeile.
+    last_row[0] enthält danach die höchste geschriebene Zeilennummer.
+    """
+    data_rows = iter(data_rows)
+    pending = next(data_rows, None)
+    prototype = None
+    for row_num, row_xml in template_rows:
+        while pending is not None and pending[0] < row_num:
+            yield build_row_xml(pending[0], None, (), pending[1])
+            last_row[0] = pending[0]
+            pending = next(data_rows, None)
+        if row_num < config.start_row:
+            yield row_xml
+        else:
+            open_tag, cells = template_row_cells(row_xml)
+            kept = [cell for cell in cells if cell[0] not in cleared_cols]
+            prototype = (open_tag, kept)
+            new_cells = ()
+            if pending is not None and pending[0] == row_num:
+                new_cells = pending[1]
+                pending = next(data_rows, None)
+            yield build_row_xml(row_num, open_tag, kept, new_cells)
+        last_row[0] = row_num
+    while pending is not None:
+        if prototype is not None:
+            yield build_row_xml(pending[0], *repeat_template_row(prototype, pending[0]), pending[1])
+        else:
+            yield build_row_xml(pending[0], None, (), pending[1])
+        last_row[0] = pending[0]
+        pending = next(data_rows, None)
+
+
+def extend_range_list(sqref, template_end, last_row):
+    """
+    Verlängert alle Bereiche einer sqref-Liste (z.B. "E5:E2000"), die bis zum Vorlagenende reichen,
+    um die Zeilen, die über das Vorlagenende hinaus geschrieben wurden.
+    """
+    grow = last_row - template_end
+    if grow <= 0:
+        return sqref
+    ranges = []
+    for cell_range in sqref.split():
+        min_col, min_row, max_col, max_row = range_bounds(cell_range)
+        if ":" in cell_range and max_row is not None and max_row >= template_end:
+            cell_range = f"{col_letter_of(min_col)}{min_row}:{col_letter_of(max_col)}{max_row + grow}"
+        ranges.append(cell_range)
+    return " ".join(ranges)
+
+
+def write_sheet_member(out, central, part_name, head, body_pieces, last_row, dimension_cols, pool, threads):
+    """
+    Komprimiert den Blattinhalt schon beim Erzeugen (parallel) in eine temporäre Datei. Der Kopf
+    mit der <dimension> wird erst danach komprimiert, wenn die letzte Zeile bekannt ist, und als
+    eigener Deflate-Block vorangestellt.
+    """
+    with tempfile.TemporaryFile() as body_file:
+        body_crc, body_size, body_compressed = deflate_parallel(
+            iter_byte_blocks(body_pieces), config.compression_level, pool, body_file, 2 * threads)
+
+        min_col, max_col = dimension_cols
+        head = re.sub(r'<dimension ref="[^"]*"/>',
+                      f'<dimension ref="{col_letter_of(min_col)}1:{col_letter_of(max_col)}{max(last_row[0], 1)}"/>',
+                      head, count=1)
+        head_bytes = head.encode("utf-8")
+        head_compressed = deflate_block(head_bytes, config.compression_level, b"", False)
+        crc = crc32_combine(zlib.crc32(head_bytes), body_crc, body_size)
+        zip_write_entry(out, central, part_name, zipfile.ZIP_DEFLATED, crc,
+                        len(head_compressed) + body_compressed, len(head_bytes) + body_size,
+                        time.localtime(), 0, [head_compressed, body_file])
+
+
+def drop_calc_chain(name, data):
+    """Entfernt Verweise auf xl/calcChain.xml (Excel baut die Berechnungskette selbst neu auf)."""
+    text = data.decode("utf-8")
+    if name == "[Content_Types].xml":
+        text = re.sub(r'<Override[^>]*PartName="/xl/calcChain\.xml"[^>]*/>', "", text)
+    else:
+        text = re.sub(r'<Relationship[^>]*Target="[^"]*calcChain\.xml"[^>]*/>', "", text)
+    return text.encode("utf-8")
+
+
+def with_sheet_tail(body, tail, template_end, last_row):
+    """
+    Hängt den Rest des Blatt-XML (ab </sheetData>) an die Zeilen an. Datenüberprüfungen und
+    bedingte Formate werden dabei auf die tatsächliche Zeilenzahl verlängert (nur die sqref-Angaben).
+    """
+    yield from body
+    yield sqref_re.sub(lambda ref: f'sqref="{extend_range_list(ref.group(1), template_end, last_row[0])}"', tail)
+
+
+def template_snapshot_path(template_path, suffix):
+    """Pfad des Snapshots einer Vorlage; der Dateiname enthält den Hash des Vorlageninhalts."""
+    with open(template_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:32]
+    return os.path.join(config.template_snapshot_dir, f"{digest}_{suffix}")
+
+
+def read_template_snapshot(path, loader):
+    """Lädt einen Snapshot; fehlt er oder ist er unbrauchbar, wird None geliefert (dann neu erstellen)."""
+    try:
+        with open(path, "rb") as f:
+            data = loader(f)
+        os.utime(path)  # zuletzt benutzt, für das Aufräumen
+        return data
+    except Exception:
+        return None
+
+
+def write_template_snapshot(path, dumper, data):
+    """Speichert einen Snapshot atomar und löscht die ältesten über template_snapshot_max_files."""
+    try:
+        os.makedirs(config.template_snapshot_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=config.template_snapshot_dir)
+        with os.fdopen(fd, "wb") as f:
+            dumper(data, f)
+        os.replace(tmp_path, path)
+        snapshots = [os.path.join(config.template_snapshot_dir, name) for name in os.listdir(config.template_snapshot_dir)
+                     if not name.endswith(".tmp")]
+        snapshots.sort(key=os.path.getmtime, reverse=True)
+        for old_path in snapshots[config.template_snapshot_max_files:]:
+            os.remove(old_path)
+    except OSError as e:
+        print(f"Hinweis: Vorlagen-Snapshot konnte nicht gespeichert werden ({e}).")
+
+
+# Zerlegte Vorlagenblätter je (Pfad, Blatt, Änderungszeit, Größe): mehrere Läufe im selben Prozess
+# (Aufteilen, Auftragsliste) zerlegen dieselbe Vorlage nur einmal
+template_sheets = {}
+
+
+def load_template_sheet(zin, template_path, sheet, save_snapshot=True):
+    """
+    Liefert (Teilname, Kopf, Zeilen, Rest) des Blatts sheet aus der Vorlage. Zwischengespeichert im
+    Prozess und als Snapshot (JSON) in template_snapshot_dir. save_snapshot=False, wenn die Vorlage
+    gleich überschrieben wird: ihr Inhalts-Hash kommt dann nie wieder vor.
+    """
+    stat = os.stat(template_path)
+    key = (os.path.abspath(template_path), sheet, stat.st_mtime_ns, stat.st_size)
+    if key not in template_sheets:
+        snapshot_path = None
+        snapshot = None
+        if config.template_snapshot_dir:
+            sheet_key = hashlib.blake2b(sheet.encode("utf-8"), digest_size=4).hexdigest()
+            snapshot_path = template_snapshot_path(template_path, f"{sheet_key}.xml.json")
+            snapshot = read_template_snapshot(snapshot_path, json.load)
+        if snapshot is None:
+            part_name = find_sheet_part(zin, sheet)
+            head, rows, tail = split_sheet_xml(zin.read(part_name).decode("utf-8"))
+            snapshot = {"part_name": part_name, "head": head, "rows": rows, "tail": tail}
+            if snapshot_path and save_snapshot:
+                write_template_snapshot(snapshot_path, lambda data, f: f.write(
+                    json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")), snapshot)
+        template_sheets[key] = (snapshot["part_name"], snapshot["head"], snapshot["rows"], snapshot["tail"])
+    return template_sheets[key]
+
+
+def write_workbook_xml(template_path, output_path, sheet, rows):
+    """
+    Schreibt die Zeilen aus iter_excel_rows direkt in das Blatt-XML der Vorlage und speichert
+    das Ergebnis unter output_path. Gibt die höchste belegte Zeilennummer zurück.
+    """
+    cleared_cols = mapped_column_indices()
+
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=out_dir)
+    try:
+        with zipfile.ZipFile(template_path) as zin, open(template_path, "rb") as fin, os.fdopen(fd, "wb") as out:
+            in_place = os.path.abspath(template_path) == os.path.abspath(output_path)
+            with measure_stage("vorlage_laden"):
+                part_name, head, template_rows, tail = load_template_sheet(zin, template_path, sheet, not in_place)
+            print(f"Tabellenblatt '{sheet}' gefunden ({part_name}).\n")
+            dim = re.search(r'<dimension ref="([^"]*)"/>', head)
+            min_col, _, max_col, template_end = range_bounds(dim.group(1)) if dim else (1, 1, 1, None)
+            if template_end is None:
+                template_end = template_rows[-1][0] if template_rows else config.start_row - 1
+            dimension_cols = (min(min_col, min(cleared_cols)), max(max_col, max(cleared_cols)))
+            names = set(zin.namelist())
+            has_calc_chain = "xl/calcChain.xml" in names
+
+            central = []
+            last_row = [0]
+            threads = config.compression_threads or os.cpu_count() or 1
+            # Leeren der alten Zeilen passiert hier beim Schreiben (iter_sheet_rows); "speichern" ist
+            # das Übernehmen der übrigen Teile der Vorlage
+            with ThreadPoolExecutor(max_workers=threads) as pool, measure_stage("speichern"):
+                for info in zin.infolist():
+                    if info.filename == part_name:
+                        body = iter_sheet_rows(template_rows, rows, cleared_cols, last_row)
+                        body = with_sheet_tail(body, tail, template_end, last_row)
+                        with measure_stage("schreiben"):
+                            write_sheet_member(out, central, part_name, head, body, last_row, dimension_cols,
+                                               pool, threads)
+                    elif has_calc_chain and info.filename == "xl/calcChain.xml":
+                        continue
+                    elif has_calc_chain and info.filename in ("[Content_Types].xml", "xl/_rels/workbook.xml.rels"):
+                        data = drop_calc_chain(info.filename, zin.read(info))
+                        compressed = deflate_block(data, config.compression_level, b"", True)
+                        zip_write_entry(out, central, info.filename, zipfile.ZIP_DEFLATED, zlib.crc32(data),
+                                        len(compressed), len(data), info.date_time, info.flag_bits, [compressed])
+                    else:
+                        # Unveränderte Teile: komprimierte Bytes 1:1 übernehmen
+                        zip_write_entry(out, central, info.filename, info.compress_type, info.CRC,
+                                        info.compress_size, info.file_size, info.date_time, info.flag_bits,
+                                        [read_raw_member(fin, info)])
+            zip_finish(out, central)
+        replace_with_temp(tmp_path, output_path, template_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return last_row[0]
@@ -0,0 +1,170 @@
+"""
+ZIP-/Deflate-Werkzeuge für beide Schreibwege: Einträge mit bereits komprimierten Daten schreiben,
+rohe Einträge aus der Vorlage übernehmen und große Teile blockweise parallel komprimieren.
+"""
+import os
+import zlib
+import struct
+from collections import deque
+
+
+def crc32_combine(crc1, crc2, len2):
+    """CRC32 von A+B aus crc(A), crc(B) und len(B) (wie zlib crc32_combine)."""
+    def times(matrix, vec):
+        result = 0
+        i = 0
+        while vec:
+            if vec & 1:
+                result ^= matrix[i]
+            vec >>= 1
+            i += 1
+        return result
+
+    def square(matrix):
+        return [times(matrix, matrix[n]) for n in range(32)]
+
+    if len2 <= 0:
+        return crc1
+    odd = [0xEDB88320] + [1 << n for n in range(31)]
+    even = square(odd)
+    odd = square(even)
+    while True:
+        even = square(odd)
+        if len2 & 1:
+            crc1 = times(even, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+        odd = square(even)
+        if len2 & 1:
+            crc1 = times(odd, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+    return crc1 ^ crc2
+
+
+def zip_dos_time(date_time):
+    """Datum/Uhrzeit als (DOS-Zeit, DOS-Datum) für die ZIP-Header."""
+    year, month, day, hour, minute, second = date_time[:6]
+    return (hour << 11) | (minute << 5) | (second // 2), ((max(year, 1980) - 1980) << 9) | (month << 5) | day
+
+
+def zip_write_entry(out, central, name, method, crc, compress_size, file_size, date_time, flag_bits, data_parts):
+    """
+    Schreibt einen ZIP-Eintrag mit bereits komprimierten Daten (data_parts: bytes oder Dateiobjekte)
+    und merkt sich den Eintrag für das zentrale Verzeichnis.
+    """
+    if compress_size > 0xFFFFFFFF or file_size > 0xFFFFFFFF:
+        raise ValueError(f"'{name}' ist zu groß für eine xlsx-Datei (über 4 GB).")
+    name_bytes = name.encode("utf-8")
+    flag_bits = (flag_bits & 0x0800) | (0 if name.isascii() else 0x0800)
+    dos_time, dos_date = zip_dos_time(date_time)
+    offset = out.tell()
+    out.write(struct.pack("<IHHHHHIIIHH", 0x04034B50, 20, flag_bits, method, dos_time, dos_date,
+                          crc, compress_size, file_size, len(name_bytes), 0))
+    out.write(name_bytes)
+    for part in data_parts:
+        if isinstance(part, bytes):
+            out.write(part)
+        else:
+            part.seek(0)
+            while True:
+                block = part.read(1 << 20)
+                if not block:
+                    break
+                out.write(block)
+    central.append(struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, 20, 20, flag_bits, method, dos_time,
+                               dos_date, crc, compress_size, file_size, len(name_bytes), 0, 0, 0, 0, 0,
+                               offset) + name_bytes)
+
+
+def zip_finish(out, central):
+    """Schreibt zentrales Verzeichnis und Abschlussdatensatz."""
+    if len(central) > 0xFFFF:
+        raise ValueError("Zu viele Teile in der Excel-Datei.")
+    cd_offset = out.tell()
+    for record in central:
+        out.write(record)
+    cd_size = out.tell() - cd_offset
+    out.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, len(central), len(central), cd_size, cd_offset, 0))
+
+
+def replace_with_temp(tmp_path, output_path, fallback_mode_source):
+    """
+    Ersetzt output_path durch die fertige temporäre Datei. Die Dateirechte der bisherigen Datei
+    (bzw. von fallback_mode_source) werden übernommen statt der 0600 von mkstemp.
+    """
+    mode_source = output_path if os.path.exists(output_path) else fallback_mode_source
+    os.chmod(tmp_path, os.stat(mode_source).st_mode & 0o777)
+    os.replace(tmp_path, output_path)
+
+
+def read_raw_member(fin, info):
+    """Liest die komprimierten Bytes eines ZIP-Eintrags unverändert aus der Vorlage."""
+    fin.seek(info.header_offset)
+    header = fin.read(30)
+    if header[:4] != b"PK\x03\x04":
+        raise ValueError(f"Beschädigter Eintrag '{info.filename}' in der Excel-Vorlage.")
+    name_len, extra_len = struct.unpack("<HH", header[26:30])
+    fin.seek(info.header_offset + 30 + name_len + extra_len)
+    return fin.read(info.compress_size)
+
+
+# Blockgröße für die parallele Kompression; jeder Block wird mit den letzten 32 KB des
+# vorherigen Blocks als Wörterbuch komprimiert, damit die Datei kaum größer wird.
+deflate_block_size = 1 << 20
+
+
+def deflate_block(data, level, zdict, final):
+    """Komprimiert einen Block als rohen Deflate-Abschnitt, der sich an den vorherigen anhängen lässt."""
+    if zdict:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def iter_byte_blocks(pieces):
+    """Fasst Text- bzw. Byte-Stücke zu Blöcken von etwa deflate_block_size Bytes zusammen."""
+    buffer = []
+    buffered = 0
+    for piece in pieces:
+        if isinstance(piece, str):
+            piece = piece.encode("utf-8")
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= deflate_block_size:
+            yield b"".join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def deflate_parallel(blocks, level, pool, out_file, max_pending):
+    """
+    Komprimiert die Blöcke parallel im Thread-Pool (zlib gibt dabei den GIL frei) und schreibt
+    das Ergebnis in Reihenfolge nach out_file; höchstens max_pending Blöcke sind gleichzeitig
+    im Speicher. Gibt (crc32, unkomprimierte Größe, komprimierte Größe) zurück.
+    """
+    pending = deque()
+    crc = 0
+    size = 0
+    compressed_size = 0
+    previous = b""
+    for block in blocks:
+        pending.append(pool.submit(deflate_block, block, level, previous[-32768:], False))
+        crc = zlib.crc32(block, crc)
+        size += len(block)
+        previous = block
+        while len(pending) >= max_pending:
+            compressed = pending.popleft().result()
+            out_file.write(compressed)
+            compressed_size += len(compressed)
+    pending.append(pool.submit(deflate_block, b"", level, b"", True))  # abschließender Block
+    while pending:
+        compressed = pending.popleft().result()
+        out_file.write(compressed)
+        compressed_size += len(compressed)
+    return crc, size, compressed_size